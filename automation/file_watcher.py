@@ -2,44 +2,199 @@
 
 import os
 import time
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from brain.claude_client import PersonalClaude
+from brain.claude_client import PersonalClaude, get_claude
 
 
 class FileHandler(FileSystemEventHandler):
-    """Handle file events"""
+    """Handle file events
+    
+    Events are debounced: a file is processed once it has been quiet for
+    DEBOUNCE_SECONDS (or waited MAX_WAIT_SECONDS), and every file that is
+    ready at the same time goes to Claude in one batch.
+    """
+    
+    DEBOUNCE_SECONDS = 0.2
+    MAX_WAIT_SECONDS = 2.0
+    POLL_SECONDS = 0.1
+    MAX_PROCESSED = 10000
+    MAX_READ_BYTES = 1024 * 1024  # Summary uses 10k chars; embeddings far less
     
     def __init__(self, claude: PersonalClaude):
         self.claude = claude
-        self.processed = set()
+        self.processed = OrderedDict()  # Bounded LRU of file/content keys
+        self.pending = {}  # filepath -> (first_seen, last_seen)
+        self.lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._worker = threading.Thread(target=self._flusher, daemon=True)
+        self._worker.start()
     
     def on_created(self, event):
         if event.is_directory:
             return
         
         filepath = event.src_path
-        if filepath in self.processed:
+        key = self._file_key(filepath)
+        
+        now = time.monotonic()
+        with self.lock:
+            # Duplicate event for a file we already handled
+            if key is None or key in self.processed:
+                return
+            first_seen, _ = self.pending.get(filepath, (now, now))
+            self.pending[filepath] = (first_seen, now)
+    
+    def on_modified(self, event):
+        # A file still being written keeps pushing its debounce deadline back
+        if event.is_directory:
             return
         
-        time.sleep(1)
+        with self.lock:
+            if event.src_path in self.pending:
+                first_seen, _ = self.pending[event.src_path]
+                self.pending[event.src_path] = (first_seen, time.monotonic())
+    
+    def stop(self):
+        """Stop the flusher thread after processing what is already queued"""
+        self._stop_event.set()
+        self._worker.join()
+        self._flush(force=True)
+    
+    def _flusher(self):
+        """Worker loop: drain quiet paths every POLL_SECONDS"""
+        while not self._stop_event.wait(self.POLL_SECONDS):
+            self._flush()
+    
+    def _flush(self, force: bool = False):
+        """Process every pending path whose debounce window has closed"""
+        now = time.monotonic()
+        with self.lock:
+            ready = [
+                filepath for filepath, (first_seen, last_seen) in self.pending.items()
+                if force
+                or now - last_seen >= self.DEBOUNCE_SECONDS
+                or now - first_seen >= self.MAX_WAIT_SECONDS
+            ]
+            for filepath in ready:
+                del self.pending[filepath]
         
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            if len(content.strip()) > 0:
-                print(f"\n📄 New file: {Path(filepath).name}")
-                summary = self.claude.summarize_file(content, filepath)
-                print(f"✅ Indexed:\n{summary}\n")
+        if ready:
+            self._process_batch(ready)
+    
+    def _process_batch(self, filepaths: list):
+        """Read the ready files and summarize them in one Claude call"""
+        files = []
+        keys = []
+        for filepath in filepaths:
+            try:
+                # Bounded read: a 500MB drop shouldn't be decoded in full
+                with open(filepath, 'rb') as f:
+                    raw = f.read(self.MAX_READ_BYTES)
+                
+                # Same bytes under another name (or a re-saved copy) = skip
+                content_key = hashlib.sha256(raw).digest()
+                with self.lock:
+                    if content_key in self.processed:
+                        continue
                 
-                self.processed.add(filepath)
+                content = raw.decode('utf-8', errors='ignore')
+                if len(content.strip()) > 0:
+                    print(f"\n📄 New file: {Path(filepath).name}")
+                    files.append((filepath, content))
+                    keys.append((self._file_key(filepath), content_key))
+            
+            except Exception as e:
+                print(f"Error processing {filepath}: {e}")
+        
+        if not files:
+            return
+        
+        try:
+            summaries = self.claude.summarize_files_batch(files)
+        except Exception as e:
+            print(f"Error processing batch of {len(files)} file(s): {e}")
+            return
         
+        # Push the batch's buffered vectors to ChromaDB now: this process
+        # never searches, and main.py's search_files can't see them until then
+        try:
+            self.claude.memory.flush()
         except Exception as e:
-            print(f"Error processing {filepath}: {e}")
+            print(f"⚠️ Warning: Could not flush indexed files: {e}")
+        
+        for (filepath, _), file_keys, summary in zip(files, keys, summaries):
+            print(f"✅ Indexed {Path(filepath).name}:\n{summary}\n")
+            self._mark_processed(*file_keys)
+    
+    @staticmethod
+    def _file_key(filepath: str):
+        """sha256 of path + mtime + size, or None if the file is gone"""
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return hashlib.sha256(
+            f"{filepath}:{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8')
+        ).digest()
+    
+    def _mark_processed(self, *keys):
+        """Remember processed keys, evicting the oldest past MAX_PROCESSED"""
+        with self.lock:
+            for key in keys:
+                if key is None:
+                    continue
+                self.processed[key] = True
+                self.processed.move_to_end(key)
+            while len(self.processed) > self.MAX_PROCESSED:
+                self.processed.popitem(last=False)
+
+
+POLLING_TIMEOUT = 5  # Seconds between scans when falling back to polling
+
+
+def _native_observer_class():
+    """Native FS-event observer for this platform (ImportError if none)"""
+    if sys.platform.startswith('linux'):
+        from watchdog.observers.inotify import InotifyObserver
+        return InotifyObserver
+    if sys.platform == 'darwin':
+        from watchdog.observers.fsevents import FSEventsObserver
+        return FSEventsObserver
+    if sys.platform == 'win32':
+        from watchdog.observers.read_directory_changes import WindowsApiObserver
+        return WindowsApiObserver
+    if 'bsd' in sys.platform:
+        from watchdog.observers.kqueue import KqueueObserver
+        return KqueueObserver
+    raise ImportError(f"No native file watcher for {sys.platform}")
+
+
+def _start_observer(event_handler: FileSystemEventHandler, path: str):
+    """Start a native observer, or a slow PollingObserver if that fails
+    
+    Why not watchdog's Observer alias:
+    - It silently drops to 1s polling (stat every file, every second)
+    - Here the fallback polls every POLLING_TIMEOUT seconds and says so
+    """
+    try:
+        observer = _native_observer_class()()
+        observer.schedule(event_handler, path, recursive=False)
+        observer.start()
+        return observer
+    except (ImportError, OSError) as e:
+        # Missing backend, or e.g. inotify watch limit reached
+        from watchdog.observers.polling import PollingObserver
+        print(f"⚠️ Native file watching unavailable ({e}), polling every {POLLING_TIMEOUT}s")
+        observer = PollingObserver(timeout=POLLING_TIMEOUT)
+        observer.schedule(event_handler, path, recursive=False)
+        observer.start()
+        return observer
 
 
 def start_watching(folder: str = "./files/watched"):
@@ -50,18 +205,19 @@ def start_watching(folder: str = "./files/watched"):
     print(f"👀 Watching: {folder_path.absolute()}")
     print("Drop files here - they'll be auto-indexed!\n")
     
-    claude = PersonalClaude()
+    claude = get_claude()
     event_handler = FileHandler(claude)
-    observer = Observer()
-    observer.schedule(event_handler, str(folder_path), recursive=False)
-    observer.start()
+    observer = _start_observer(event_handler, str(folder_path))
     
     try:
-        while True:
-            time.sleep(1)
+        # Block on the observer thread; the 1s timeout only keeps Ctrl+C
+        # responsive on Windows, where a bare join() ignores it
+        while observer.is_alive():
+            observer.join(1)
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
+    event_handler.stop()
 
 
 if __name__ == "__main__":
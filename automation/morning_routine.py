@@ -6,14 +6,14 @@ from datetime import datetime
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from brain.claude_client import PersonalClaude
+from brain.claude_client import get_claude
 
 
 def morning_routine():
     """Run morning routine"""
     print(f"\n☀️ Good morning! ({datetime.now().strftime('%A, %B %d, %Y')})\n")
     
-    claude = PersonalClaude()
+    claude = get_claude()
     
     prompt = """It's the start of a new day. Please:
 1. Review my active goals
@@ -22,8 +22,8 @@ def morning_routine():
 
 Keep it concise and actionable."""
     
-    response = claude.chat(prompt)
-    print(response)
+    claude.chat(prompt, stream=True)
+    print()
     print("\n" + "="*60 + "\n")
 
 
@@ -35,9 +35,17 @@ def schedule_routines():
     # print("⏰ Scheduled: Morning routine at 8:00 AM")
     # print("Running scheduler... (Ctrl+C to stop)\n")
     
+    # Nothing scheduled (e.g. the daily job above is commented out) = done
+    if not schedule.get_jobs():
+        return
+    
     while True:
+        # Sleep until the next job is due instead of a fixed 60s tick
+        idle = schedule.idle_seconds()
+        if idle is None:
+            return  # All jobs cancelled
+        time.sleep(max(0, idle))
         schedule.run_pending()
-        time.sleep(60)
 
 
 if __name__ == "__main__":
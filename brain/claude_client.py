@@ -2,13 +2,212 @@
 
 import os
 import re
-from anthropic import Anthropic
+import json
+import time
+import atexit
+import random
+import asyncio
+import threading
+import importlib.util
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from anthropic import (
+    Anthropic, AsyncAnthropic, APIConnectionError, APIStatusError, RateLimitError,
+    DefaultHttpxClient
+)
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import List, Dict, Tuple, Iterator
 from .memory import Memory
+from .response_cache import ResponseCache
+
+try:
+    import orjson  # Optional: faster parsing of JSON replies
+except ImportError:
+    orjson = None
 
 load_dotenv()
 
+# Built once at import (no per-instance rebuild, no stray indentation tokens)
+BASE_SYSTEM_PROMPT = """You are a personal AI operating system with persistent memory.
+
+Your capabilities:
+- Remember facts when user says "remember that...", "don't forget...", "keep in mind that..."
+- Recall information when asked
+- Apply saved preferences and styles
+- Help organize thoughts and decisions
+- Provide emotional support
+- Maintain context across sessions
+
+Be conversational, helpful, and proactive. You're a thought partner.
+
+When the user shares important information naturally in conversation, you can suggest:
+"Would you like me to remember that?" to help build their knowledge base."""
+
+# generate_explanation: teacher persona instead of the assistant one
+TEACHING_SYSTEM_PROMPT = (
+    "You are an expert teacher providing clear, structured explanations. "
+    "Your goal is to help learners deeply understand concepts. "
+    "Format your response in Markdown with:\n"
+    "- Clear headers for sections\n"
+    "- Bullet points for key concepts\n"
+    "- Code blocks for examples\n"
+    "- Emphasis on practical application\n"
+    "Keep explanations concise but thorough."
+)
+
+EXPLANATION_REQUEST_TEMPLATE = """I am learning {skill_name} at a {skill_level} level.
+
+Please explain: {topic}"""
+
+EXPLANATION_GUIDANCE_TEMPLATE = """
+
+**Special focus/approach requested by learner:**
+{custom_guidance}
+
+Please tailor your explanation to address this guidance while still maintaining clarity and structure."""
+
+EXPLANATION_STRUCTURE = """
+
+Structure your explanation with:
+1. **Overview**: Brief introduction (2-3 sentences)
+2. **Key Concepts**: Main ideas to understand
+3. **Examples**: Practical demonstrations
+4. **Common Pitfalls**: What to watch out for
+5. **Practice Tips**: How to master this
+6. **Related Topics**: What to explore next
+
+Keep it practical and actionable."""
+
+MAX_API_ATTEMPTS = 5
+
+# Memory commands: "remember that/to X", "don't forget (that) X",
+# "please remember (that) X", "keep in mind (that) X" - matched against
+# the lowercased message
+REMEMBER_PATTERN = re.compile(
+    r"(?:remember that |remember to |don't forget (?:that )?"
+    r"|please remember (?:that )?|keep in mind (?:that )?)"
+    r"(?P<fact>.+?)(?:\.|$)"
+)
+
+# Every REMEMBER_PATTERN phrasing contains one of these; cheap pre-check
+MEMORY_TRIGGER_WORDS = ("remember", "forget", "keep in mind")
+
+# Entity heuristics used by _extract_entity
+_SUBJECT_VERB_PATTERN = re.compile(
+    r"^(\w+(?:\s+\w+)?)\s+(?:is|was|has|have|lives?|works?|likes?)", re.IGNORECASE
+)
+_MY_THING_PATTERN = re.compile(r"my (\w+(?:\s+\w+)?)", re.IGNORECASE)
+
+# Seconds a built memory block is reused before the next turn rebuilds it
+MEMORY_BLOCK_TTL = 5
+
+# Conversation window: past this many messages, the oldest are summarized
+MAX_HISTORY_MESSAGES = 40
+HISTORY_WINDOW_STEP = 20
+
+HISTORY_SUMMARY_INSTRUCTION = (
+    "Summarize this conversation between the user and their AI assistant. "
+    "Keep facts, decisions, open questions and anything the user asked to "
+    "remember. Use concise bullet points."
+)
+
+SUMMARIZE_INSTRUCTION = "Summarize the file the user sends in 2-3 sentences."
+
+# Files longer than SUMMARY_SINGLE_CHARS are summarized map-reduce style:
+# SUMMARY_CHUNK_CHARS windows summarized in parallel, then combined.
+# Anything past MAX_SUMMARY_CHARS is left out of the summary.
+SUMMARY_SINGLE_CHARS = 10000
+SUMMARY_CHUNK_CHARS = 8000
+MAX_SUMMARY_CHARS = 64000
+
+SUMMARIZE_CHUNK_INSTRUCTION = (
+    "The user sends one part of a larger file. "
+    "Summarize that part in 2-3 sentences."
+)
+
+SUMMARIZE_COMBINE_INSTRUCTION = (
+    "The user sends summaries of consecutive parts of one file. "
+    "Combine them into a single 2-3 sentence summary of the whole file."
+)
+
+SUMMARIZE_BATCH_INSTRUCTION = (
+    "The user sends several files, each wrapped in <file name=\"...\"> tags. "
+    "Summarize each file in 2-3 sentences. Respond with ONLY a JSON array of "
+    "summary strings, one per file, in the same order as the files."
+)
+
+# Files per batch request: keeps the JSON reply well inside max_tokens
+BATCH_SUMMARY_MAX_FILES = 8
+
+# ```json ... ``` around a reply that was asked to be bare JSON
+_CODE_FENCE_PATTERN = re.compile(r"^\s*```[\w-]*\s*\n(.*?)\n?\s*```\s*$", re.DOTALL)
+
+
+# Runs the per-turn memory search while chat() does its other prep work
+# (history summary, memory block); process-wide to amortize thread startup
+_LOOKUP_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="chat-lookup")
+
+# Runs the per-chunk calls of large-file summaries in parallel
+_SUMMARY_POOL = ThreadPoolExecutor(
+    max_workers=MAX_SUMMARY_CHARS // SUMMARY_CHUNK_CHARS, thread_name_prefix="summarize"
+)
+
+
+# How long an idle pooled connection is kept for the next request
+KEEPALIVE_SECONDS = 120
+
+# One pooled HTTP client shared by every PersonalClaude in the process, so
+# the watcher / morning routine / main loop reuse warm TLS connections
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _shared_http_client() -> httpx.Client:
+    """Create (once) the process-wide HTTP client, HTTP/2 if h2 is installed"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = DefaultHttpxClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=httpx.Limits(
+                    max_connections=32,
+                    max_keepalive_connections=16,
+                    # httpx drops idle connections after 5s by default, i.e.
+                    # between almost every pair of chat turns
+                    keepalive_expiry=KEEPALIVE_SECONDS
+                )
+            )
+            atexit.register(_http_client.close)
+        return _http_client
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits, overload (529), server errors and dropped connections"""
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """Exponential backoff with jitter: ~1s, 2s, 4s, 8s..."""
+    return 2 ** attempt + random.random()
+
+
+def _loads(text: str):
+    """Parse JSON with orjson when installed, stdlib json otherwise"""
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Reply text without a surrounding Markdown code fence, if it has one"""
+    match = _CODE_FENCE_PATTERN.match(text)
+    return match.group(1) if match else text
+
+
+def _cached_block(text: str) -> Dict:
+    """System prompt block marked as a prompt-cache breakpoint"""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
 
 class PersonalClaude:
     """Claude with memory and personality"""
@@ -22,106 +221,133 @@ class PersonalClaude:
         if not self.api_key.startswith("sk-ant-"):
             print("⚠️ Warning: API key format looks unusual. Expected format: sk-ant-...")
         
-        self.client = Anthropic(api_key=self.api_key)
+        # max_retries=0: _call_claude's backoff loop is the only retry layer
+        self.client = Anthropic(api_key=self.api_key, http_client=_shared_http_client(),
+                                max_retries=0)
         self.model = os.getenv("CLAUDE_MODEL", "claude-sonnet-4-5-20250929")
         self.memory = Memory()
+        self.response_cache = ResponseCache()
         
-        self.base_system_prompt = """You are a personal AI operating system with persistent memory.
+        # Memory block (recent facts, goals, style), rebuilt when stale
+        self._memory_block_cache = None  # {'fact_keys': frozenset, 'text': str, 'ts': float}
+        self._memory_block_lock = threading.Lock()
         
-Your capabilities:
-- Remember facts when user says "remember that...", "don't forget...", "keep in mind that..."
-- Recall information when asked
-- Apply saved preferences and styles
-- Help organize thoughts and decisions
-- Provide emotional support
-- Maintain context across sessions
-
-Be conversational, helpful, and proactive. You're a thought partner.
-
-When the user shares important information naturally in conversation, you can suggest:
-"Would you like me to remember that?" to help build their knowledge base."""
+        # Last history summary: (first message, last dropped message, summary)
+        self._history_summary = None
+        
+        self.base_system_prompt = BASE_SYSTEM_PROMPT
     
-    def chat(self, user_message: str, conversation_history: List[Dict] = None,
-            include_memories: bool = True) -> str:
-        """Chat with memory-augmented context"""
+    def _call_claude(self, cache: bool = False, stream: bool = False, **request) -> str:
+        """Call messages.create with retry/backoff, returning the reply text
         
-        system_prompt = self.base_system_prompt
+        Args:
+            cache: Serve identical requests from the on-disk response cache.
+                Only for deterministic-enough tasks (summaries, rewrites),
+                never for chat.
+            stream: Print the reply to stdout as it arrives
+            **request: Passed straight to messages.create
+        """
+        key = None
+        if cache:
+            key = ResponseCache.make_key(**request)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                if stream:
+                    print(cached, end="", flush=True)
+                return cached
         
-        if include_memories:
-            # Collect all memories
-            all_facts = []
-            
-            # 1. Semantic search for relevant facts
-            relevant_facts = self.memory.recall(user_message, n_results=5)
-            all_facts.extend(relevant_facts)
-            
-            # 2. Get recent facts (might overlap with semantic search)
-            recent_facts = self.memory.get_recent_facts(limit=10)
-            for fact in recent_facts:
-                all_facts.append({
-                    'entity': fact['entity'],
-                    'fact': fact['fact'],
-                    'context': fact.get('context')
-                })
-            
-            # 3. Deduplicate facts
-            unique_facts = self._deduplicate_facts(all_facts)
-            
-            # 4. Search for relevant conversations (if available)
-            past_conversations = self.memory.recall_conversations(user_message, n_results=2)
-            
-            # Build context section
-            if unique_facts or past_conversations:
-                system_prompt += "\n\n=== WHAT YOU KNOW ABOUT THE USER ===\n"
-                
-                if unique_facts:
-                    system_prompt += "\nRelevant information:\n"
-                    for mem in unique_facts[:15]:  # Limit to prevent token bloat
-                        entity = mem.get('entity', 'general')
-                        fact = mem.get('fact', '')
-                        system_prompt += f"- {entity}: {fact}\n"
-                
-                # Add past conversations (with truncation)
-                if past_conversations:
-                    system_prompt += "\n\nRelevant past conversations:\n"
-                    for conv in past_conversations:
-                        preview = conv['conversation'][:300] + "..."
-                        timestamp = conv.get('timestamp', '')[:10] if conv.get('timestamp') else "Unknown"
-                        topic = conv.get('topic', 'general')
-                        system_prompt += f"\n[{timestamp} - {topic}]\n{preview}\n"
-            
-            # Add active goals (if any)
-            goals = self.memory.get_active_goals()
-            if goals:
-                system_prompt += "\n\nUser's active goals:\n"
-                for goal in goals[:5]:  # Limit to 5 most recent
-                    system_prompt += f"- {goal['goal']}"
-                    if goal['deadline']:
-                        system_prompt += f" (deadline: {goal['deadline']})"
-                    system_prompt += "\n"
-            
-            # Add preferences
-            writing_style = self.memory.get_preference("writing_style")
-            if writing_style:
-                system_prompt += f"\n\nUser's writing style: {writing_style}\n"
+        if stream:
+            chunks = []
+            for chunk in self._stream_claude(**request):
+                print(chunk, end="", flush=True)
+                chunks.append(chunk)
+            text = "".join(chunks)
+        else:
+            for attempt in range(MAX_API_ATTEMPTS):
+                try:
+                    response = self.client.messages.create(**request)
+                    break
+                except Exception as e:
+                    if not _is_retryable(e) or attempt == MAX_API_ATTEMPTS - 1:
+                        raise
+                    time.sleep(_backoff_seconds(attempt))
+            text = response.content[0].text
         
-        # Prepare messages - use shallow copy to avoid modifying original
-        messages = list(conversation_history) if conversation_history else []
-        messages.append({"role": "user", "content": user_message})
+        if key:
+            self.response_cache.set(key, text)
+        return text
+    
+    def _stream_claude(self, **request) -> Iterator[str]:
+        """Yield reply text chunks from messages.stream as they arrive
+        
+        Retries with backoff like _call_claude, but only until the first
+        chunk is out - after that the caller has shown it, and a retry
+        would repeat it.
+        """
+        for attempt in range(MAX_API_ATTEMPTS):
+            started = False
+            try:
+                with self.client.messages.stream(**request) as response_stream:
+                    for chunk in response_stream.text_stream:
+                        started = True
+                        yield chunk
+                return
+            except Exception as e:
+                if started or not _is_retryable(e) or attempt == MAX_API_ATTEMPTS - 1:
+                    raise
+                time.sleep(_backoff_seconds(attempt))
+    
+    def _async_client(self) -> AsyncAnthropic:
+        """New AsyncAnthropic for one asyncio.run()
+        
+        Why not one per instance:
+        - Its connection pool belongs to the event loop that first used it
+        - Each asyncio.run() is a new loop; a reused client then fails with
+          "Event loop is closed" or stale connections
+        """
+        return AsyncAnthropic(api_key=self.api_key, max_retries=0)
+    
+    async def _acall_claude(self, aclient: AsyncAnthropic, cache: bool = False,
+                            **request) -> str:
+        """Async version of _call_claude, on the caller's aclient"""
+        key = None
+        if cache:
+            key = ResponseCache.make_key(**request)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        for attempt in range(MAX_API_ATTEMPTS):
+            try:
+                response = await aclient.messages.create(**request)
+                break
+            except Exception as e:
+                if not _is_retryable(e) or attempt == MAX_API_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(_backoff_seconds(attempt))
+        
+        text = response.content[0].text
+        if key:
+            self.response_cache.set(key, text)
+        return text
+    
+    def chat(self, user_message: str, conversation_history: List[Dict] = None,
+            include_memories: bool = True, stream: bool = False) -> str:
+        """Chat with memory-augmented context
         
-        # Truncate conversation history if too long (keep last 20 exchanges = 40 messages)
-        if len(messages) > 40:
-            messages = messages[-40:]
+        The system prompt is sent as content blocks so Anthropic can serve
+        the static base prompt and the slowly-changing memory block from
+        its prompt cache; only the query-dependent tail is billed in full.
+        
+        With stream=True the reply is printed as it arrives (and still
+        returned), so the caller should not print it again. Use
+        chat_stream() to render the chunks yourself.
+        """
+        request = self._build_chat_request(user_message, conversation_history,
+                                           include_memories)
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                system=system_prompt,
-                messages=messages
-            )
-            
-            assistant_message = response.content[0].text
+            assistant_message = self._call_claude(stream=stream, **request)
             
             # Process any memory commands in the user's message
             self._process_memory_commands(user_message, assistant_message)
@@ -131,9 +357,231 @@ When the user shares important information naturally in conversation, you can su
         except Exception as e:
             print(f"❌ Error calling Claude API: {e}")
             raise
+    
+    def chat_stream(self, user_message: str, conversation_history: List[Dict] = None,
+                    include_memories: bool = True) -> Iterator[str]:
+        """Like chat(), but yields the reply in chunks as they arrive
+        
+        Memory commands are processed once the whole reply is in.
+        """
+        request = self._build_chat_request(user_message, conversation_history,
+                                           include_memories)
+        
+        try:
+            chunks = []
+            for chunk in self._stream_claude(**request):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            print(f"❌ Error calling Claude API: {e}")
+            raise
+        
+        self._process_memory_commands(user_message, "".join(chunks))
+    
+    def _build_chat_request(self, user_message: str, conversation_history: List[Dict],
+                            include_memories: bool) -> Dict:
+        """Assemble the messages.create kwargs for a chat turn"""
+        # Start the semantic search now; it only needs the message itself
+        search_future = None
+        if include_memories:
+            search_future = _LOOKUP_POOL.submit(
+                self.memory.search_context, user_message, 5, 2
+            )
+        
+        # Slide the window first: older messages are replaced by a summary,
+        # so only the kept tail of a long history gets copied
+        history = conversation_history or []
+        history_summary = None
+        if len(history) + 1 > MAX_HISTORY_MESSAGES:
+            history, history_summary = self._truncate_history(history)
+        
+        # Prepare messages - use shallow copy to avoid modifying original
+        messages = list(history)
+        messages.append({"role": "user", "content": user_message})
+        
+        system_blocks = [_cached_block(self.base_system_prompt)]
+        context_block = None
+        
+        if include_memories:
+            # 1. Recent facts, goals, style: cached for MEMORY_BLOCK_TTL seconds
+            memory_block = self._get_memory_block()
+            if memory_block['text']:
+                system_blocks.append(_cached_block(memory_block['text']))
+            
+            # 2. Semantic search for this message (started at the top)
+            search = search_future.result()
+            
+            # 3. Drop search hits already listed in the memory block
+            relevant_facts = self._deduplicate_facts(
+                search['relevant_facts'], seen=set(memory_block['fact_keys'])
+            )
+            
+            context_block = self._build_context_block(
+                relevant_facts, search['past_conversations']
+            )
+        
+        if history_summary:
+            system_blocks.append(_cached_block(
+                f"Summary of the earlier part of this conversation:\n{history_summary}"
+            ))
+        
+        # Query-dependent context goes last so it doesn't break the cached prefix
+        if context_block:
+            system_blocks.append({"type": "text", "text": context_block})
+        
+        return {
+            "model": self.model,
+            "max_tokens": 4096,
+            "system": system_blocks,
+            "messages": messages
+        }
+    
+    def _truncate_history(self, history: List[Dict]) -> Tuple[List[Dict], str]:
+        """Keep the recent history and summarize the rest
+        
+        The cut point moves in steps of HISTORY_WINDOW_STEP messages (counting
+        the new user message), so the dropped prefix and its summary only
+        change every few turns and both the summary call and the summary
+        block stay cached. While the prefix is unchanged, the previous
+        summary is reused without rebuilding the transcript.
+        
+        Returns:
+            (kept history, summary of dropped messages or "")
+        """
+        total = len(history) + 1  # + the new user message
+        cut = ((total - HISTORY_WINDOW_STEP) // HISTORY_WINDOW_STEP) * HISTORY_WINDOW_STEP
+        
+        # The kept window must start with a user message
+        while cut < len(history) and history[cut]['role'] != 'user':
+            cut += 1
+        
+        memo = self._history_summary
+        if memo and cut and memo[0] is history[0] and memo[1] is history[cut - 1]:
+            summary = memo[2]
+        else:
+            summary = self._summarize_history(history[:cut])
+            # Failed summaries ("") aren't kept, so the next turn retries
+            self._history_summary = (history[0], history[cut - 1], summary) if summary else None
+        
+        return history[cut:], summary
+    
+    def _summarize_history(self, messages: List[Dict]) -> str:
+        """Summarize dropped conversation messages (empty string on failure)"""
+        transcript = "\n\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
+        
+        try:
+            return self._call_claude(
+                cache=True,
+                model=self.model,
+                max_tokens=1024,
+                system=[_cached_block(HISTORY_SUMMARY_INSTRUCTION)],
+                messages=[{"role": "user", "content": transcript}]
+            )
+        except Exception as e:
+            print(f"⚠️ Warning: Could not summarize earlier conversation: {e}")
+            return ""
+    
+    def _get_memory_block(self) -> Dict:
+        """Get the cached memory block, building it now if missing or stale
+        
+        Turns within MEMORY_BLOCK_TTL seconds of the last build skip the
+        SQL entirely. Writes made through this client invalidate the block
+        (_invalidate_memory_block), so the TTL only bounds how long writes
+        from other processes take to show up.
+        
+        Why not a background refresher:
+        - It queried SQLite every few seconds even while idle
+        - It kept running (and failing) after memory was closed
+        """
+        with self._memory_block_lock:
+            cached = self._memory_block_cache
+        
+        if cached is None or time.monotonic() - cached['ts'] > MEMORY_BLOCK_TTL:
+            cached = self._refresh_memory_block()
+        return cached
+    
+    def _refresh_memory_block(self) -> Dict:
+        """Rebuild the memory block from the database and cache it"""
+        profile = self.memory.get_profile_context(n_facts=10, n_goals=5)
+        recent_facts = self._deduplicate_facts(profile['recent_facts'])
+        cached = {
+            'fact_keys': frozenset(self._fact_key(fact) for fact in recent_facts),
+            'text': self._build_memory_block(
+                recent_facts, profile['goals'], profile['writing_style']
+            ),
+            'ts': time.monotonic()
+        }
+        with self._memory_block_lock:
+            self._memory_block_cache = cached
+        return cached
+    
+    def _invalidate_memory_block(self):
+        """Force the next chat turn to rebuild the memory block"""
+        with self._memory_block_lock:
+            self._memory_block_cache = None
+    
+    def _build_memory_block(self, recent_facts: List[Dict], goals: List[Dict],
+                            writing_style: str = None) -> str:
+        """Build the slowly-changing memory section (facts, goals, style)
+        
+        Why separate from the per-message context:
+        - Same text turn after turn = prompt cache hit
+        - Anything query-dependent goes in _build_context_block instead
+        """
+        sections = []
+        
+        if recent_facts:
+            lines = ["=== WHAT YOU KNOW ABOUT THE USER ===", "", "Known information:"]
+            for mem in recent_facts:
+                entity = mem.get('entity', 'general')
+                fact = mem.get('fact', '')
+                lines.append(f"- {entity}: {fact}")
+            sections.append("\n".join(lines))
+        
+        # Add active goals (if any)
+        if goals:
+            lines = ["User's active goals:"]
+            for goal in goals[:5]:  # Limit to 5 most recent
+                line = f"- {goal['goal']}"
+                if goal['deadline']:
+                    line += f" (deadline: {goal['deadline']})"
+                lines.append(line)
+            sections.append("\n".join(lines))
+        
+        # Add preferences
+        if writing_style:
+            sections.append(f"User's writing style: {writing_style}")
+        
+        return "\n\n".join(sections)
+    
+    def _build_context_block(self, relevant_facts: List[Dict],
+                             past_conversations: List[Dict]) -> str:
+        """Build the per-message context (semantic recall results)"""
+        sections = []
+        
+        if relevant_facts:
+            lines = ["Relevant information:"]
+            for mem in relevant_facts[:15]:  # Limit to prevent token bloat
+                entity = mem.get('entity', 'general')
+                fact = mem.get('fact', '')
+                lines.append(f"- {entity}: {fact}")
+            sections.append("\n".join(lines))
+        
+        # Add past conversations (with truncation)
+        if past_conversations:
+            lines = ["Relevant past conversations:"]
+            for conv in past_conversations:
+                preview = conv['conversation'][:300] + "..."
+                timestamp = conv.get('timestamp', '')[:10] if conv.get('timestamp') else "Unknown"
+                topic = conv.get('topic', 'general')
+                lines.append(f"\n[{timestamp} - {topic}]\n{preview}")
+            sections.append("\n".join(lines))
+        
+        return "\n\n".join(sections)
 
     def generate_explanation(self, topic: str, skill_name: str, 
-                            skill_level: str, custom_guidance: str = None) -> str:
+                            skill_level: str, custom_guidance: str = None,
+                            stream: bool = False) -> str:
         """
         Generate a structured explanation for learning
         
@@ -149,77 +597,59 @@ When the user shares important information naturally in conversation, you can su
             skill_name: Skill context (e.g., "Python Programming")
             skill_level: User's level (e.g., "beginner", "intermediate")
             custom_guidance: Optional additional instructions for the explanation (e.g., "focus on examples", "keep it short")
+            stream: Print the explanation as it arrives (it is still returned)
         
         Returns:
             Markdown-formatted explanation
         """
-        # Custom system prompt for teaching
-        system_prompt = (
-            "You are an expert teacher providing clear, structured explanations. "
-            "Your goal is to help learners deeply understand concepts. "
-            "Format your response in Markdown with:\n"
-            "- Clear headers for sections\n"
-            "- Bullet points for key concepts\n"
-            "- Code blocks for examples\n"
-            "- Emphasis on practical application\n"
-            "Keep explanations concise but thorough."
-        )
-        
         # Build focused prompt
-        user_message = f"""I am learning {skill_name} at a {skill_level} level.
-
-        Please explain: {topic}"""
-
+        parts = [EXPLANATION_REQUEST_TEMPLATE.format(
+            skill_name=skill_name, skill_level=skill_level, topic=topic
+        )]
+        
         # Add custom guidance if provided
         if custom_guidance:
-            user_message += f"""
-
-            **Special focus/approach requested by learner:**
-            {custom_guidance}
-
-            Please tailor your explanation to address this guidance while still maintaining clarity and structure."""
-
+            parts.append(EXPLANATION_GUIDANCE_TEMPLATE.format(custom_guidance=custom_guidance))
+        
         # Add standard structure request
-        user_message += """
-
-        Structure your explanation with:
-        1. **Overview**: Brief introduction (2-3 sentences)
-        2. **Key Concepts**: Main ideas to understand
-        3. **Examples**: Practical demonstrations
-        4. **Common Pitfalls**: What to watch out for
-        5. **Practice Tips**: How to master this
-        6. **Related Topics**: What to explore next
-
-        Keep it practical and actionable."""
-
-
+        parts.append(EXPLANATION_STRUCTURE)
+        user_message = "".join(parts)
         
         try:
-            response = self.client.messages.create(
+            return self._call_claude(
+                stream=stream,
                 model=self.model,
                 max_tokens=4096,
-                system=system_prompt,  # ← Custom prompt for teaching
+                system=TEACHING_SYSTEM_PROMPT,  # ← Custom prompt for teaching
                 messages=[{"role": "user", "content": user_message}]
             )
             
-            return response.content[0].text
-            
         except Exception as e:
             print(f"❌ Error generating explanation: {e}")
             raise
     
-    def _deduplicate_facts(self, facts_list: List[Dict]) -> List[Dict]:
-        """Remove duplicate facts based on entity and fact content"""
-        seen = set()
+    @staticmethod
+    def _fact_key(fact: Dict) -> str:
+        """Case/whitespace-insensitive 'entity:fact' identity of a fact"""
+        entity = (fact.get('entity') or '').lower().strip()
+        fact_text = (fact.get('fact') or '').lower().strip()
+        return f"{entity}:{fact_text}"
+    
+    def _deduplicate_facts(self, facts_list: List[Dict], seen: set = None) -> List[Dict]:
+        """Remove duplicate facts based on entity and fact content
+        
+        Args:
+            facts_list: Facts in priority order (first occurrence wins)
+            seen: Keys to treat as already present; updated in place
+        """
+        if seen is None:
+            seen = set()
         unique = []
         
         for fact in facts_list:
-            # Create a unique key from entity and fact
-            entity = fact.get('entity', '').lower().strip()
-            fact_text = fact.get('fact', '').lower().strip()
-            key = f"{entity}:{fact_text}"
+            key = self._fact_key(fact)
             
-            if key not in seen and fact_text:  # Only add non-empty facts
+            if key not in seen and (fact.get('fact') or '').strip():  # Only add non-empty facts
                 seen.add(key)
                 unique.append(fact)
         
@@ -234,44 +664,38 @@ When the user shares important information naturally in conversation, you can su
         - "please remember X"
         - "keep in mind that X"
         """
+        # One lowercase copy, one precompiled search (first command only)
         user_lower = user_msg.lower()
         
-        # Pattern 1: "remember that..." or "remember to..." or "don't forget..."
-        remember_patterns = [
-            r"remember that (.+?)(?:\.|$)",
-            r"remember to (.+?)(?:\.|$)",
-            r"don't forget (?:that )?(.+?)(?:\.|$)",
-            r"please remember (?:that )?(.+?)(?:\.|$)",
-            r"keep in mind (?:that )?(.+?)(?:\.|$)",
-        ]
+        # Most messages contain no trigger word at all: skip the regex
+        if not any(word in user_lower for word in MEMORY_TRIGGER_WORDS):
+            return
         
-        for pattern in remember_patterns:
-            match = re.search(pattern, user_lower, re.IGNORECASE)
-            if match:
-                fact = match.group(1).strip()
-                
-                # Try to extract entity (subject of the fact)
-                entity = self._extract_entity(fact)
-                
-                try:
-                    self.memory.remember_fact(entity, fact, context=user_msg)
-                    # Don't print confirmation - let the assistant handle it naturally
-                except Exception as e:
-                    print(f"⚠️ Warning: Failed to save memory: {e}")
-                
-                break  # Only process first match
+        match = REMEMBER_PATTERN.search(user_lower)
+        if match:
+            fact = match.group('fact').strip()
+            
+            # Try to extract entity (subject of the fact)
+            entity = self._extract_entity(fact)
+            
+            try:
+                self.memory.remember_fact(entity, fact, context=user_msg)
+                self._invalidate_memory_block()  # New fact shows up next turn
+                # Don't print confirmation - let the assistant handle it naturally
+            except Exception as e:
+                print(f"⚠️ Warning: Failed to save memory: {e}")
     
     def _extract_entity(self, fact: str) -> str:
         """Try to extract the main entity/subject from a fact"""
         # Simple heuristic: look for common patterns
         
         # Pattern: "X is/was/has/lives..."
-        match = re.match(r"^(\w+(?:\s+\w+)?)\s+(?:is|was|has|have|lives?|works?|likes?)", fact, re.IGNORECASE)
+        match = _SUBJECT_VERB_PATTERN.match(fact)
         if match:
             return match.group(1).lower()
         
         # Pattern: "my X..."
-        match = re.search(r"my (\w+(?:\s+\w+)?)", fact, re.IGNORECASE)
+        match = _MY_THING_PATTERN.search(fact)
         if match:
             return f"user's {match.group(1).lower()}"
         
@@ -286,41 +710,115 @@ When the user shares important information naturally in conversation, you can su
         
         return "general"
     
-    def apply_writing_style(self, text: str) -> str:
-        """Apply user's saved writing style"""
+    def apply_writing_style(self, text: str, stream: bool = False) -> str:
+        """Apply user's saved writing style (stream=True prints as it arrives)"""
         style = self.memory.get_preference("writing_style")
         if not style:
             style = "casual, concise, active voice"
         
-        prompt = f"Edit this text according to this style: {style}\n\nText:\n{text}"
+        # Style instruction is the stable prefix; only the text varies
+        instruction = f"Edit the user's text according to this style: {style}\nReturn only the edited text."
         
         try:
-            response = self.client.messages.create(
+            return self._call_claude(
+                cache=True,
+                stream=stream,
                 model=self.model,
                 max_tokens=2048,
-                messages=[{"role": "user", "content": prompt}]
+                system=[_cached_block(instruction)],
+                messages=[{"role": "user", "content": f"Text:\n{text}"}]
             )
-            
-            return response.content[0].text
         except Exception as e:
             print(f"❌ Error applying writing style: {e}")
             return text  # Return original text on error
     
-    def summarize_file(self, content: str, filename: str) -> str:
-        """Summarize a file and index it"""
-        # Truncate very large files
-        content_preview = content[:10000] if len(content) > 10000 else content
+    def _summary_request(self, instruction: str, prompt: str) -> Dict:
+        """messages.create kwargs for one summarize call"""
+        return {
+            "model": self.model,
+            "max_tokens": 1024,
+            "system": [_cached_block(instruction)],
+            "messages": [{"role": "user", "content": prompt}]
+        }
+    
+    def _chunk_summary_requests(self, content: str, filename: str) -> List[Dict]:
+        """One request per SUMMARY_CHUNK_CHARS window of a large file"""
+        starts = range(0, min(len(content), MAX_SUMMARY_CHARS), SUMMARY_CHUNK_CHARS)
+        return [
+            self._summary_request(
+                SUMMARIZE_CHUNK_INSTRUCTION,
+                f"File: {filename} (part {number} of {len(starts)})\n\n"
+                f"{content[start:start + SUMMARY_CHUNK_CHARS]}"
+            )
+            for number, start in enumerate(starts, 1)
+        ]
+    
+    def _combine_summary_request(self, filename: str, chunk_summaries: List[str]) -> Dict:
+        """Request that merges the per-chunk summaries of a file"""
+        parts = "\n\n".join(
+            f"Part {number}: {summary}"
+            for number, summary in enumerate(chunk_summaries, 1)
+        )
+        return self._summary_request(
+            SUMMARIZE_COMBINE_INSTRUCTION, f"File: {filename}\n\n{parts}"
+        )
+    
+    def summarize_file(self, content: str, filename: str, stream: bool = False) -> str:
+        """Summarize a file and index it (stream=True prints as it arrives)
+        
+        Files over SUMMARY_SINGLE_CHARS are split into chunks that are
+        summarized in parallel and then combined, so the summary covers
+        more than the first few pages without N sequential round-trips.
+        """
+        try:
+            # Cache key covers filename + content, so re-indexing is free
+            if len(content) <= SUMMARY_SINGLE_CHARS:
+                request = self._summary_request(
+                    SUMMARIZE_INSTRUCTION, f"File: {filename}\n\n{content}"
+                )
+            else:
+                futures = [
+                    _SUMMARY_POOL.submit(self._call_claude, cache=True, **request)
+                    for request in self._chunk_summary_requests(content, filename)
+                ]
+                request = self._combine_summary_request(
+                    filename, [future.result() for future in futures]
+                )
+            
+            summary = self._call_claude(cache=True, stream=stream, **request)
+            
+            # Index the file
+            self.memory.index_file(filename, content, summary)
+            
+            return summary
+        except Exception as e:
+            print(f"❌ Error summarizing file: {e}")
+            return f"File: {filename} (summary failed)"
+    
+    async def asummarize_file(self, content: str, filename: str,
+                              aclient: AsyncAnthropic = None) -> str:
+        """Async version of summarize_file (same prompts, same indexing)
         
-        prompt = f"Summarize this file ({filename}) in 2-3 sentences:\n\n{content_preview}"
+        aclient: client to share with other calls on this event loop; a
+        temporary one is opened (and closed) when not given.
+        """
+        if aclient is None:
+            async with self._async_client() as aclient:
+                return await self.asummarize_file(content, filename, aclient)
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            if len(content) <= SUMMARY_SINGLE_CHARS:
+                request = self._summary_request(
+                    SUMMARIZE_INSTRUCTION, f"File: {filename}\n\n{content}"
+                )
+            else:
+                chunk_summaries = await asyncio.gather(*(
+                    self._acall_claude(aclient, cache=True, **request)
+                    for request in self._chunk_summary_requests(content, filename)
+                ))
+                request = self._combine_summary_request(filename, list(chunk_summaries))
             
-            summary = response.content[0].text
+            summary = await self._acall_claude(aclient, cache=True, **request)
             
             # Index the file
             self.memory.index_file(filename, content, summary)
@@ -328,4 +826,92 @@ When the user shares important information naturally in conversation, you can su
             return summary
         except Exception as e:
             print(f"❌ Error summarizing file: {e}")
-            return f"File: {filename} (summary failed)"
\ No newline at end of file
+            return f"File: {filename} (summary failed)"
+    
+    async def asummarize_files(self, files: List[Tuple[str, str]]) -> List[str]:
+        """Summarize (filename, content) pairs concurrently
+        
+        Wall time is roughly one round-trip instead of one per file.
+        """
+        async with self._async_client() as aclient:
+            return list(await asyncio.gather(*(
+                self.asummarize_file(content, filename, aclient)
+                for filename, content in files
+            )))
+    
+    def summarize_files_batch(self, files: List[Tuple[str, str]]) -> List[str]:
+        """Summarize and index several files with a single Claude request
+        
+        Args:
+            files: List of (filename, content) pairs
+        
+        Returns:
+            Summaries in the same order as files
+        
+        Why one request:
+        - File drops come in bursts (copying a folder)
+        - N files = 1 round-trip instead of N (per BATCH_SUMMARY_MAX_FILES)
+        - Falls back to concurrent per-file calls if the reply can't be parsed
+        
+        The reply is cached only once it parses into one summary per file,
+        so a truncated or malformed reply is retried next time, not replayed.
+        """
+        if len(files) > BATCH_SUMMARY_MAX_FILES:
+            return [
+                summary
+                for start in range(0, len(files), BATCH_SUMMARY_MAX_FILES)
+                for summary in self.summarize_files_batch(
+                    files[start:start + BATCH_SUMMARY_MAX_FILES]
+                )
+            ]
+        
+        if len(files) == 1:
+            filename, content = files[0]
+            return [self.summarize_file(content, filename)]
+        
+        prompt = "\n\n".join(
+            f'<file name="{filename}">\n{content[:SUMMARY_SINGLE_CHARS]}\n</file>'
+            for filename, content in files
+        )
+        request = {
+            "model": self.model,
+            "max_tokens": 1024 * len(files),
+            "system": [_cached_block(SUMMARIZE_BATCH_INSTRUCTION)],
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        key = ResponseCache.make_key(**request)
+        cached = self.response_cache.get(key)
+        
+        try:
+            reply = cached if cached is not None else self._call_claude(**request)
+            summaries = _loads(_strip_code_fence(reply))
+            if not isinstance(summaries, list) or len(summaries) != len(files):
+                raise ValueError("summary count does not match file count")
+        except Exception as e:
+            if cached is not None:
+                self.response_cache.delete(key)  # Don't replay a bad reply
+            print(f"⚠️ Warning: Batch summary failed, summarizing files concurrently: {e}")
+            return asyncio.run(self.asummarize_files(files))
+        
+        if cached is None:
+            self.response_cache.set(key, reply)
+        
+        for (filename, content), summary in zip(files, summaries):
+            self.memory.index_file(filename, content, str(summary))
+        
+        return [str(summary) for summary in summaries]
+
+
+# Process-wide instance: Memory (SQLite + ChromaDB) and the API clients
+# are expensive to set up, so entry points share one PersonalClaude
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_claude() -> PersonalClaude:
+    """Get the shared PersonalClaude, creating it on first use"""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = PersonalClaude()
+        return _instance
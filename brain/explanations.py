@@ -1,7 +1,51 @@
+import os
+import queue
+import weakref
+from functools import lru_cache
 from pathlib import Path
 import re
+import threading
 from typing import Optional, List, Tuple
 
+# Compiled once at import instead of looked up in re's cache on every call
+_NON_WORD_SPACE_HYPHEN = re.compile(r'[^\w\s-]')
+_SPACES_HYPHENS = re.compile(r'[-\s]+')
+_NON_WORD = re.compile(r'[^\w]')
+
+
+@lru_cache(maxsize=256)
+def _safe_skill_name(skill_name: str) -> str:
+    """Skill name with special chars removed and spaces/hyphens -> underscores"""
+    return _SPACES_HYPHENS.sub('_', _NON_WORD_SPACE_HYPHEN.sub('', skill_name))
+
+
+@lru_cache(maxsize=4096)
+def _topic_title(stem: str) -> str:
+    """Filename stem back to a readable topic, e.g. list_comps -> List Comps"""
+    return stem.replace('_', ' ').title()
+
+
+def _write_loop(write_queue: queue.Queue, errors: list):
+    """Writer thread: write queued (filepath, bytes) pairs in order
+    
+    A module function (not a method), so the thread holds no reference to
+    its ExplanationManager. Failures are recorded for flush() to raise.
+    """
+    while True:
+        filepath, data = write_queue.get()
+        try:
+            try:
+                ExplanationManager._write_file(filepath, data)
+            except FileNotFoundError:
+                # Folder was removed since we created it
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                ExplanationManager._write_file(filepath, data)
+        except Exception as e:
+            print(f"❌ Error saving explanation {filepath}: {e}")
+            errors.append((filepath, e))
+        finally:
+            write_queue.task_done()
+
 
 class ExplanationManager:
     """Manages saving and retrieving explanations as Markdown files"""
@@ -16,6 +60,14 @@ class ExplanationManager:
         - Keeps __init__ lightweight
         """
         self.base_path = Path(base_path)
+        self._folder_cache = {}  # (skill_id, skill_name) -> Path
+        self._created_folders = set()  # Folders already mkdir'd by this process
+        self._lock = threading.Lock()
+        
+        # Background writer: saves return as soon as the file is queued
+        self._write_queue = queue.Queue()
+        self._write_errors = []  # (filepath, exception) not yet raised by flush()
+        self._writer = None  # Started on first save
     
     def _get_skill_folder(self, skill_id: int, skill_name: str) -> Path:
         """
@@ -28,11 +80,16 @@ class ExplanationManager:
         - Name makes folders human-readable
         - Underscore separates them clearly
         """
-        # Sanitize skill name for folder (remove special chars, spaces)
-        safe_name = re.sub(r'[^\w\s-]', '', skill_name)
-        safe_name = re.sub(r'[-\s]+', '_', safe_name)
+        key = (skill_id, skill_name)
+        folder = self._folder_cache.get(key)
+        if folder is None:
+            # Sanitize skill name for folder (remove special chars, spaces)
+            safe_name = _safe_skill_name(skill_name)
+            folder = self.base_path / f"{skill_id}_{safe_name}"
+            with self._lock:
+                self._folder_cache[key] = folder
         
-        return self.base_path / f"{skill_id}_{safe_name}"
+        return folder
     
     def _sanitize_topic(self, topic: str) -> str:
         """
@@ -49,9 +106,9 @@ class ExplanationManager:
         # Convert to lowercase
         topic = topic.lower()
         # Replace spaces and hyphens with underscores
-        topic = re.sub(r'[-\s]+', '_', topic)
+        topic = _SPACES_HYPHENS.sub('_', topic)
         # Remove any character that's not alphanumeric or underscore
-        topic = re.sub(r'[^\w]', '', topic)
+        topic = _NON_WORD.sub('', topic)
         # Limit length
         topic = topic[:100]
         
@@ -65,19 +122,28 @@ class ExplanationManager:
         Returns: (success: bool, filepath: str)
         
         Why return tuple:
-        - bool = caller knows if it worked
+        - bool = caller knows if the save was accepted (path valid, folder
+          created, file queued)
         - filepath = caller can show user where it saved
         
         Why create folders here (not __init__):
         - Lazy initialization = only create when needed
         - No wasted folders for unused features
+        
+        Why a background writer:
+        - The file write is queued, so the caller isn't blocked on disk I/O
+        - Reads in this class wait for queued writes, so they see the save
+        - A write that fails is printed, and raised by the next flush()
         """
         try:
             # Get skill folder path
             skill_folder = self._get_skill_folder(skill_id, skill_name)
             
-            # Create folder if doesn't exist
-            skill_folder.mkdir(parents=True, exist_ok=True)
+            # Create folder if doesn't exist (once per folder per process)
+            if skill_folder not in self._created_folders:
+                skill_folder.mkdir(parents=True, exist_ok=True)
+                with self._lock:
+                    self._created_folders.add(skill_folder)
             
             # Sanitize topic for filename
             safe_topic = self._sanitize_topic(topic)
@@ -85,14 +151,66 @@ class ExplanationManager:
             # Create file path
             filepath = skill_folder / f"{safe_topic}.md"
             
-            # Write content
-            filepath.write_text(content, encoding='utf-8')
+            # Queue content for the writer thread (encoded here, on the caller)
+            self._start_writer()
+            self._write_queue.put((filepath, content.encode('utf-8')))
             
             return True, str(filepath)
             
         except Exception as e:
             return False, str(e)
     
+    def flush(self):
+        """
+        Block until every queued explanation has been written to disk
+        
+        Raises OSError if any queued write failed since the last flush(),
+        so a save that returned (True, path) can't fail silently.
+        """
+        self._write_queue.join()
+        
+        errors = []
+        while self._write_errors:  # pop() is atomic; the writer may append
+            errors.append(self._write_errors.pop(0))
+        if errors:
+            filepath, error = errors[0]
+            raise OSError(
+                f"{len(errors)} explanation(s) failed to save, "
+                f"first {filepath}: {error}"
+            ) from error
+    
+    def _start_writer(self):
+        """Start the writer thread on first use"""
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=_write_loop, args=(self._write_queue, self._write_errors),
+                    daemon=True
+                )
+                self._writer.start()
+                # Daemon thread: don't lose queued saves at interpreter exit.
+                # finalize, not atexit.register(self.flush): holds only the
+                # queue, so the manager itself can still be collected
+                weakref.finalize(self, self._write_queue.join)
+    
+    @staticmethod
+    def _write_file(filepath: Path, data: bytes):
+        """Write already-encoded bytes with raw os.open/os.write
+        
+        Why not write_text/write_bytes:
+        - Content is encoded once on the caller's thread
+        - No file object / buffering layer for a single write
+        """
+        # O_BINARY (Windows only): no newline translation, same bytes everywhere
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(filepath, flags, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]  # os.write may write partially
+        finally:
+            os.close(fd)
+    
     def get_explanation(self, skill_id: int, skill_name: str, 
                        topic: str) -> Optional[str]:
         """
@@ -106,6 +224,7 @@ class ExplanationManager:
         - Caller can easily check: if content is None
         """
         try:
+            self._write_queue.join()  # See queued saves (errors stay for flush())
             skill_folder = self._get_skill_folder(skill_id, skill_name)
             safe_topic = self._sanitize_topic(topic)
             filepath = skill_folder / f"{safe_topic}.md"
@@ -130,22 +249,23 @@ class ExplanationManager:
         - Hides implementation details
         """
         try:
+            self._write_queue.join()  # See queued saves (errors stay for flush())
             skill_folder = self._get_skill_folder(skill_id, skill_name)
             
             if not skill_folder.exists():
                 return []
             
-            # Get all .md files
-            md_files = skill_folder.glob("*.md")
-            
-            # Convert filenames back to readable topics
-            topics = []
-            for file in md_files:
+            # Get all .md files (scandir: no Path object or stat per entry)
+            with os.scandir(skill_folder) as entries:
                 # Remove .md extension and convert underscores to spaces
-                topic = file.stem.replace('_', ' ').title()
-                topics.append(topic)
+                topics = [
+                    _topic_title(entry.name[:-3])
+                    for entry in entries
+                    if entry.name.endswith('.md') and entry.is_file()
+                ]
             
-            return sorted(topics)
+            topics.sort()
+            return topics
             
         except Exception:
             return []
@@ -160,6 +280,7 @@ class ExplanationManager:
         - Simpler than loading full content just to check
         - Single responsibility principle
         """
+        self._write_queue.join()
         skill_folder = self._get_skill_folder(skill_id, skill_name)
         safe_topic = self._sanitize_topic(topic)
         filepath = skill_folder / f"{safe_topic}.md"
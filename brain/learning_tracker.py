@@ -1,28 +1,423 @@
 """Learning tracking system with spaced repetition and skill management"""
 
+import copy
+import re
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from functools import wraps
 from pathlib import Path
-from typing import List, Dict, Optional
-import pyperclip
+from typing import List, Dict, Iterator, Optional
 import json
 
+try:
+    import pyperclip  # Optional: copy challenge prompts to the clipboard
+except ImportError:
+    pyperclip = None
+
+
+# Applied to every connection unless tune_pragmas=False
+# - WAL + synchronous=NORMAL: commits append to the WAL instead of
+#   fsyncing a rollback journal (still durable across app crashes)
+# - temp_store / mmap_size / cache_size: keep sorts and hot pages in memory
+# WAL needs the database on a local disk: its shared-memory index doesn't
+# work over network filesystems (SMB/NFS shares, some synced folders).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA cache_size = -65536",  # 64 MiB
+)
+
+# How long a connection waits on another's write lock before "database is
+# locked" (sqlite3.connect's timeout = PRAGMA busy_timeout)
+BUSY_TIMEOUT_SECONDS = 5.0
+
+# Results kept by the read cache (see _cached_read)
+READ_CACHE_SIZE = 128
+
+# Session review offset by understanding level (1-5, index 0 unused)
+_SESSION_REVIEW_OFFSETS = (
+    None,
+    '+1 days',   # Poor understanding: review tomorrow
+    '+3 days',   # Below average: review in 3 days
+    '+7 days',   # Average: review in 1 week
+    '+14 days',  # Good: review in 2 weeks
+    '+30 days',  # Excellent: review in 1 month
+)
+
+# Words in a search query; each becomes a quoted FTS5 prefix term
+_SEARCH_TERM = re.compile(r'\w+')
+
+# SM-2 defaults for a new learning item
+SM2_INITIAL_EASE = 2.5
+SM2_MIN_EASE = 1.3
+
+
+def sm2(ease: float, interval: float, repetitions: int, quality: int):
+    """
+    One SM-2 step: (ease, interval days, repetitions) after a review
+    
+    quality: 0-5 recall grade; below 3 counts as a lapse
+    
+    Why SM-2 (not fixed 1/3/7/14/30 day steps):
+    - Intervals grow with each successful review (1, 6, then x ease)
+    - Hard items keep a lower ease, so easy ones drop out of the queue
+    
+    Returns: (new_ease, new_interval, new_repetitions)
+    """
+    if quality >= 3:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = round(interval * ease)
+        repetitions += 1
+    else:
+        # Lapse: start the item over
+        repetitions = 0
+        interval = 1
+    
+    ease += 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    return max(SM2_MIN_EASE, ease), interval, repetitions
+
+
+def _sm2_step_sql(ease, interval, repetitions, quality) -> str:
+    """sm2() as the SQL function sm2_step: the new state as a JSON array"""
+    return json.dumps(sm2(ease, interval, repetitions, quality))
+
+
+# Reschedules one item inside SQLite: sm2_step runs on the stored state,
+# so there's no SELECT round trip and executemany covers bulk reviews.
+# A wrong answer comes back in 4 hours, a right one after the new interval.
+_REVIEW_UPDATE_SQL = f"""
+    UPDATE learning_items 
+    SET times_reviewed = times_reviewed + 1,
+        times_correct = times_correct + :correct,
+        last_reviewed = CURRENT_TIMESTAMP,
+        confidence_level = :confidence,
+        ease_factor = json_extract(s.step, '$[0]'),
+        interval_days = json_extract(s.step, '$[1]'),
+        repetitions = json_extract(s.step, '$[2]'),
+        next_review = datetime('now', CASE WHEN :correct
+            THEN '+' || json_extract(s.step, '$[1]') || ' days'
+            ELSE '+4 hours' END)
+    FROM (SELECT sm2_step(COALESCE(ease_factor, {SM2_INITIAL_EASE}),
+                          COALESCE(interval_days, 0),
+                          COALESCE(repetitions, 0),
+                          :quality) AS step
+          FROM learning_items WHERE id = :id) AS s
+    WHERE learning_items.id = :id
+"""
+
+def _close_connections(conn: sqlite3.Connection, readers: list):
+    """Finalizer for a tracker that was never closed (holds no reference to it)"""
+    for reader in readers:
+        reader.close()
+    conn.close()
+
+
+def create_fts_index(cursor, table: str, columns: tuple):
+    """Create <table>_fts, its sync triggers, and backfill it once"""
+    fts = f"{table}_fts"
+    cols = ', '.join(columns)
+    new_values = ', '.join(f"new.{c}" for c in columns)
+    old_values = ', '.join(f"old.{c}" for c in columns)
+    
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,))
+    exists = cursor.fetchone() is not None
+    
+    cursor.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols},
+            content='{table}', content_rowid='id',
+            tokenize='porter unicode61'
+        )
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai
+        AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols})
+            VALUES (new.id, {new_values});
+        END
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad
+        AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols})
+            VALUES ('delete', old.id, {old_values});
+        END
+    """)
+    
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_au
+        AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols})
+            VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts}(rowid, {cols})
+            VALUES (new.id, {new_values});
+        END
+    """)
+    
+    if not exists:
+        # Existing database: index the rows already there (one time)
+        cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def fts_match(query: str) -> Optional[str]:
+    """
+    User text -> FTS5 MATCH string, or None if it has no words
+    
+    Each word becomes a quoted prefix term ("decor" finds
+    "decorators"); quoting keeps -, :, * etc. from being read as
+    FTS5 syntax.
+    """
+    terms = _SEARCH_TERM.findall(query)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _cached_read(method):
+    """
+    Cache a read-only aggregate until the database or the date changes
+    
+    Why this key:
+    - PRAGMA data_version moves when another connection commits
+    - It doesn't move for the writer's own commits; total_changes does
+    - Aggregates over "today"/"last N days" also expire at midnight
+      (local and UTC, as SQLite's 'now' is UTC)
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._cached(method.__name__, args, kwargs,
+                            lambda: method(self, *args, **kwargs))
+    return wrapper
+
+
+def serialized_write(method):
+    """
+    Run a write method under its object's _write_lock (an RLock)
+    
+    Why:
+    - All writes share one connection; without the lock, a second
+      thread's statements land inside another thread's open
+      transaction() and are committed or rolled back with it
+    - RLock: a write called inside the same thread's transaction()
+      simply re-enters
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._write_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+_REVIEW_INSERT_SQL = """
+    INSERT INTO review_history 
+    (item_id, was_correct, confidence_before, confidence_after, time_taken_seconds)
+    VALUES (:id, :was_correct, :confidence_before, :confidence, :seconds)
+"""
+
 
 class LearningTracker:
     """Track learning progress with spaced repetition"""
     
-    def __init__(self, db_path: str = "brain/knowledge.db"):
-
-        self.db_path = Path(db_path).absolute()
+    # Full-text indexed columns per table (<table>_fts, see _init_search_index)
+    _FTS_COLUMNS = {
+        'learning_items': ('question', 'answer', 'tags'),
+        'challenge_obstacles': ('obstacle_description', 'solution', 'insight'),
+    }
+    
+    # learning_challenges list column -> challenge_skill_links.relation
+    _CHALLENGE_LIST_RELATIONS = (
+        ('skills_taught', 'teaches'),
+        ('prerequisites', 'requires'),
+        ('unlocks', 'unlocks'),
+    )
+    
+    def __init__(self, db_path: str = "brain/knowledge.db", tune_pragmas: bool = True):
+        """
+        Args:
+            db_path: SQLite file (":memory:" works too)
+            tune_pragmas: Apply SQLITE_PRAGMAS (WAL etc.); turn off for
+                          throwaway/in-memory databases
+        """
+        self.db_path = Path(db_path).absolute() if db_path != ":memory:" else db_path
+        self._tune_pragmas = tune_pragmas
 
-        # Create connection
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        # Enable foreign key constraints
-        self.conn.execute("PRAGMA foreign_keys = ON")
-        # Continue with setup
-        self.conn.row_factory = sqlite3.Row
+        # Writer connection (also used for reads on the creating thread)
+        self.conn = self._connect()
+        
+        # Read connections for other threads, one each (see _reader)
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        
+        # Safety net if close() is never called: runs when the tracker is
+        # garbage collected or at exit, without resurrecting it
+        self._finalizer = weakref.finalize(self, _close_connections,
+                                           self.conn, self._readers)
+        
+        # > 0 while inside transaction(): single-row methods don't commit.
+        # _write_lock is held for the whole block (and by every write), so
+        # only the owning thread ever sees a non-zero depth
+        self._write_lock = threading.RLock()
+        self._transaction_depth = 0
+        self._transaction_thread = None  # Thread whose transaction() is open
+        
+        # (method, args, version) -> result, least recently used first
+        self._read_cache = OrderedDict()
+        self._read_cache_lock = threading.Lock()
         self._init_tables()
     
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one transaction (one commit, one fsync)
+        
+        Usage:
+            with tracker.transaction():
+                for item in items:
+                    tracker.add_learning_item(...)
+        
+        Why this approach:
+        - Each add_*/log_*/record_* call normally commits on its own
+        - Inside this block they skip that commit; the block commits once
+        - Any exception rolls the whole group back
+        - Nested blocks in the same thread simply join the outer transaction;
+          writes from other threads wait for it (_write_lock)
+        """
+        with self._write_lock:
+            outermost = self._transaction_depth == 0
+            if outermost:
+                if self.conn.in_transaction:
+                    self.conn.commit()  # Don't fold earlier pending writes into ours
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._transaction_thread = threading.get_ident()
+            
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if outermost:
+                    self.conn.rollback()
+                    self._transaction_thread = None
+                raise
+            
+            self._transaction_depth -= 1
+            if outermost:
+                self.conn.commit()
+                self._transaction_thread = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with foreign keys, pragmas and Row results"""
+        # cached_statements: room for every distinct SQL string in this class
+        conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT_SECONDS,
+                               check_same_thread=False, cached_statements=256)
+        # Enable foreign key constraints
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self._tune_pragmas:
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(pragma)
+        conn.create_function("sm2_step", 4, _sm2_step_sql, deterministic=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Connection for read-only queries
+        
+        Why per-thread readers:
+        - With WAL, readers on their own connections don't wait on each
+          other or on the writer, and each keeps a warm page cache
+        - The thread inside transaction() uses the writer, so its reads see
+          its own pending writes; so does the creating thread when no other
+          thread has a transaction open
+        - Every other thread reads committed data only
+        - :memory: databases are per-connection, so they always use the writer
+        """
+        current = threading.get_ident()
+        transaction_thread = self._transaction_thread
+        if (self.db_path == ":memory:" or transaction_thread == current
+                or (transaction_thread is None and current == self._owner_thread)):
+            return self.conn
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+    
+    @contextmanager
+    def _check_skill_exists(self, skill_id: int):
+        """
+        Turn a foreign-key failure on skill_id into ValueError
+        
+        Why not SELECT first:
+        - foreign_keys = ON already checks skill_id on insert
+        - One statement per write instead of two
+        """
+        try:
+            yield
+        except sqlite3.IntegrityError as e:
+            if 'FOREIGN KEY' not in str(e):
+                raise
+            # Skill doesn't exist!
+            raise ValueError(f"Skill ID {skill_id} does not exist") from e
+    
+    def _data_version(self):
+        """Cache version for the current database state (None = don't cache)"""
+        if self._transaction_depth:
+            return None  # Uncommitted writes could still be rolled back
+        version = (
+            self.conn.execute("PRAGMA data_version").fetchone()[0],
+            self.conn.total_changes,
+            date.today(),
+            datetime.now(timezone.utc).date(),
+        )
+        # A write in flight on another thread: total_changes has moved but
+        # readers can't see the rows yet
+        if self.conn.in_transaction:
+            return None
+        return version
+    
+    def _cached(self, name: str, args: tuple, kwargs: dict, compute):
+        """Return compute() through the LRU read cache (see _cached_read)"""
+        version = self._data_version()
+        if version is None:
+            return compute()
+        
+        key = (name, args, tuple(sorted(kwargs.items())), version)
+        with self._read_cache_lock:
+            if key in self._read_cache:
+                self._read_cache.move_to_end(key)
+                # Copy: callers may modify the dicts/lists they get back
+                return copy.deepcopy(self._read_cache[key])
+        
+        result = compute()
+        with self._read_cache_lock:
+            self._read_cache[key] = copy.deepcopy(result)
+            while len(self._read_cache) > READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return result
+    
+    def _commit(self):
+        """Commit now, unless this thread's transaction() block will commit for us"""
+        if self._transaction_thread != threading.get_ident():
+            self.conn.commit()
+    
     def _init_tables(self):
         """Initialize learning tracking tables"""
         cursor = self.conn.cursor()
@@ -97,6 +492,21 @@ class LearningTracker:
             )
         """)
         
+        cursor.execute("PRAGMA table_info(learning_items)")
+        existing_columns = [row[1] for row in cursor.fetchall()]
+        
+        # Add SM-2 scheduling state to existing table (safe migration)
+        if 'ease_factor' not in existing_columns:
+            self.conn.execute(
+                f"ALTER TABLE learning_items ADD COLUMN ease_factor REAL DEFAULT {SM2_INITIAL_EASE}"
+            )
+        
+        if 'repetitions' not in existing_columns:
+            self.conn.execute("ALTER TABLE learning_items ADD COLUMN repetitions INTEGER DEFAULT 0")
+        
+        if 'interval_days' not in existing_columns:
+            self.conn.execute("ALTER TABLE learning_items ADD COLUMN interval_days REAL DEFAULT 0")
+        
         # Review history for spaced repetition
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS review_history (
@@ -208,9 +618,249 @@ class LearningTracker:
                 FOREIGN KEY (challenge_id) REFERENCES learning_challenges(id)
             )
         """)
+        
+        self._init_search_index(cursor)
+        self._init_daily_totals(cursor)
+        self._init_query_indexes(cursor)
+        self._init_challenge_links(cursor)
             
         self.conn.commit()
     
+    def _init_search_index(self, cursor):
+        """
+        Full-text indexes for the keyword searches (see _FTS_COLUMNS)
+        
+        Why FTS5 with external content:
+        - LIKE '%q%' scans every row; MATCH uses the index
+        - content=<table> = text isn't stored twice
+        - Triggers keep it in sync; updates that don't touch indexed
+          columns (reviews, progress) don't rewrite the index
+        
+        Sets self._has_fts (False if SQLite was built without FTS5;
+        the searches then fall back to LIKE).
+        """
+        try:
+            for table, columns in self._FTS_COLUMNS.items():
+                create_fts_index(cursor, table, columns)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Warning: FTS5 unavailable, search will scan rows ({e})")
+            self._has_fts = False
+            return
+        
+        self._has_fts = True
+    
+    def _fts_query(self, query: str) -> Optional[str]:
+        """User text -> FTS5 MATCH string, or None to fall back to LIKE"""
+        return fts_match(query) if self._has_fts else None
+    
+    def _init_challenge_links(self, cursor):
+        """
+        One row per entry of a challenge's skills_taught / prerequisites /
+        unlocks list
+        
+        Why a junction table:
+        - "Which challenges teach X" is an index lookup, not a scan that
+          json.loads every row
+        - position keeps each list in its original order
+        
+        The JSON columns on learning_challenges are still written for the
+        methods that read them directly.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'challenge_skill_links'"
+        )
+        exists = cursor.fetchone() is not None
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS challenge_skill_links (
+                challenge_id INTEGER NOT NULL,
+                relation TEXT NOT NULL CHECK(relation IN ('teaches', 'requires', 'unlocks')),
+                position INTEGER NOT NULL,
+                skill_name TEXT NOT NULL,
+                PRIMARY KEY (challenge_id, relation, position),
+                FOREIGN KEY (challenge_id) REFERENCES learning_challenges(id)
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_csl_skill_rel
+            ON challenge_skill_links(skill_name COLLATE NOCASE, relation)
+        """)
+        
+        # Deleting a challenge drops its links (a trigger rather than ON DELETE
+        # CASCADE, so tables created before this also get it)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS challenge_skill_links_ad
+            AFTER DELETE ON learning_challenges BEGIN
+                DELETE FROM challenge_skill_links WHERE challenge_id = old.id;
+            END
+        """)
+        
+        if not exists:
+            # Existing database: split the JSON lists into links (one time)
+            for column, relation in self._CHALLENGE_LIST_RELATIONS:
+                cursor.execute(f"""
+                    INSERT INTO challenge_skill_links (challenge_id, relation, position, skill_name)
+                    SELECT c.id, ?, j.key, j.value
+                    FROM learning_challenges c, json_each(c.{column}) j
+                    WHERE json_valid(c.{column}) AND json_type(c.{column}) = 'array'
+                      AND j.value IS NOT NULL
+                """, (relation,))
+    
+    def _init_query_indexes(self, cursor):
+        """
+        Composite indexes matching the hot WHERE + ORDER BY clauses
+        
+        Why these columns:
+        - Review queues filter/sort on (skill_id,) next_review, confidence_level,
+          so the index order replaces a temp B-tree sort
+        - Recent sessions, challenges and milestones are always per skill
+        - A challenge's obstacles are listed newest first
+        
+        ANALYZE runs once (when there are no statistics yet) so the
+        planner knows to prefer them.
+        """
+        for index_sql in (
+            "CREATE INDEX IF NOT EXISTS idx_items_due "
+            "ON learning_items(next_review, confidence_level)",
+            "CREATE INDEX IF NOT EXISTS idx_items_skill_due "
+            "ON learning_items(skill_id, next_review, confidence_level)",
+            "CREATE INDEX IF NOT EXISTS idx_sessions_skill_date "
+            "ON learning_sessions(skill_id, session_date)",
+            "CREATE INDEX IF NOT EXISTS idx_reviews_item "
+            "ON review_history(item_id)",
+            "CREATE INDEX IF NOT EXISTS idx_challenges_skill_status "
+            "ON learning_challenges(skill_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_milestones_skill_completed "
+            "ON learning_milestones(skill_id, completed, target_date)",
+            "CREATE INDEX IF NOT EXISTS idx_obstacles_challenge "
+            "ON challenge_obstacles(challenge_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_obstacles_challenge_created "
+            "ON challenge_obstacles(challenge_id, created_at)",
+            "CREATE INDEX IF NOT EXISTS idx_evidence_skill "
+            "ON skill_evidence(skill_id)",
+            "CREATE INDEX IF NOT EXISTS idx_streaks_date "
+            "ON daily_streaks(date) WHERE maintained_streak = 1",
+        ):
+            cursor.execute(index_sql)
+        
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        if cursor.fetchone() is None:
+            cursor.execute("ANALYZE")
+    
+    def _init_daily_totals(self, cursor):
+        """
+        Per-day session and review totals, kept current by triggers
+        
+        Why buckets:
+        - Weekly/monthly stats sum a few rows per day instead of
+          scanning every session and review ever logged
+        - Triggers update them in the same transaction as the insert
+        - Due counts depend on the clock, so they stay index lookups
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'daily_session_totals'"
+        )
+        exists = cursor.fetchone() is not None
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_session_totals (
+                day DATE NOT NULL,
+                skill_id INTEGER NOT NULL,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                minutes INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, skill_id)
+            ) WITHOUT ROWID
+        """)
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS daily_review_totals (
+                day DATE PRIMARY KEY NOT NULL,
+                reviews INTEGER NOT NULL DEFAULT 0,
+                correct INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        
+        # Sessions: add on insert, subtract on delete, both on update
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_session_totals_ai
+            AFTER INSERT ON learning_sessions
+            WHEN date(new.session_date) IS NOT NULL BEGIN
+                INSERT INTO daily_session_totals (day, skill_id, sessions, minutes)
+                VALUES (date(new.session_date), new.skill_id, 1, COALESCE(new.duration_minutes, 0))
+                ON CONFLICT (day, skill_id) DO UPDATE SET
+                    sessions = sessions + 1,
+                    minutes = minutes + excluded.minutes;
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_session_totals_ad
+            AFTER DELETE ON learning_sessions BEGIN
+                UPDATE daily_session_totals
+                SET sessions = sessions - 1,
+                    minutes = minutes - COALESCE(old.duration_minutes, 0)
+                WHERE day = date(old.session_date) AND skill_id = old.skill_id;
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_session_totals_au
+            AFTER UPDATE OF session_date, skill_id, duration_minutes ON learning_sessions BEGIN
+                UPDATE daily_session_totals
+                SET sessions = sessions - 1,
+                    minutes = minutes - COALESCE(old.duration_minutes, 0)
+                WHERE day = date(old.session_date) AND skill_id = old.skill_id;
+                INSERT INTO daily_session_totals (day, skill_id, sessions, minutes)
+                SELECT date(new.session_date), new.skill_id, 1, COALESCE(new.duration_minutes, 0)
+                WHERE date(new.session_date) IS NOT NULL
+                ON CONFLICT (day, skill_id) DO UPDATE SET
+                    sessions = sessions + 1,
+                    minutes = minutes + excluded.minutes;
+            END
+        """)
+        
+        # Reviews
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_review_totals_ai
+            AFTER INSERT ON review_history
+            WHEN date(new.review_date) IS NOT NULL BEGIN
+                INSERT INTO daily_review_totals (day, reviews, correct)
+                VALUES (date(new.review_date), 1, new.was_correct = 1)
+                ON CONFLICT (day) DO UPDATE SET
+                    reviews = reviews + 1,
+                    correct = correct + excluded.correct;
+            END
+        """)
+        
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS daily_review_totals_ad
+            AFTER DELETE ON review_history BEGIN
+                UPDATE daily_review_totals
+                SET reviews = reviews - 1,
+                    correct = correct - (old.was_correct = 1)
+                WHERE day = date(old.review_date);
+            END
+        """)
+        
+        if not exists:
+            # Existing database: fill the buckets from history (one time)
+            cursor.execute("""
+                INSERT INTO daily_session_totals (day, skill_id, sessions, minutes)
+                SELECT date(session_date), skill_id, COUNT(*), COALESCE(SUM(duration_minutes), 0)
+                FROM learning_sessions
+                WHERE date(session_date) IS NOT NULL
+                GROUP BY date(session_date), skill_id
+            """)
+            cursor.execute("""
+                INSERT INTO daily_review_totals (day, reviews, correct)
+                SELECT date(review_date), COUNT(*), COALESCE(SUM(was_correct = 1), 0)
+                FROM review_history
+                WHERE date(review_date) IS NOT NULL
+                GROUP BY date(review_date)
+            """)
+    
+    @serialized_write
     def add_skill(self, skill_name: str, category: str = None, 
                   difficulty: str = 'beginner', target_level: str = None,
                   notes: str = None) -> int:
@@ -220,10 +870,9 @@ class LearningTracker:
             cursor.execute("""
                 INSERT INTO learning_skills 
                 (skill_name, category, difficulty, target_level, notes, next_review)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (skill_name, category, difficulty, target_level, notes, 
-                  datetime.now() + timedelta(days=1)))
-            self.conn.commit()
+                VALUES (?, ?, ?, ?, ?, datetime('now', '+1 day'))
+            """, (skill_name, category, difficulty, target_level, notes))
+            self._commit()
             return cursor.lastrowid
         except sqlite3.IntegrityError:
             print(f"⚠️ Skill '{skill_name}' already exists")
@@ -232,58 +881,74 @@ class LearningTracker:
     
     def get_all_skills(self, status: str = 'active') -> List[Dict]:
         """Get all skills being tracked"""
-        cursor = self.conn.cursor()
+        return list(self.iter_skills(status))
+    
+    def iter_skills(self, status: str = 'active') -> Iterator[Dict]:
+        """
+        Yield skills being tracked one at a time (see get_all_skills)
+        
+        Why a generator:
+        - Rows are read from SQLite as the caller consumes them
+        - Stopping early (first match, a page) skips the rest
+        """
+        cursor = self._reader().cursor()
+        # Counted per skill with index lookups; joining both tables and
+        # COUNT(DISTINCT) would build sessions x items rows per skill
         cursor.execute("""
             SELECT s.*, 
-                   COUNT(DISTINCT ls.id) as session_count,
-                   COUNT(DISTINCT li.id) as item_count
+                   (SELECT COUNT(*) FROM learning_sessions
+                    WHERE skill_id = s.id) as session_count,
+                   (SELECT COUNT(*) FROM learning_items
+                    WHERE skill_id = s.id) as item_count
             FROM learning_skills s
-            LEFT JOIN learning_sessions ls ON s.id = ls.skill_id
-            LEFT JOIN learning_items li ON s.id = li.skill_id
             WHERE s.status = ?
-            GROUP BY s.id
             ORDER BY s.id ASC
         """, (status,))
-        return [dict(row) for row in cursor.fetchall()]
+        for row in cursor:
+            yield dict(row)
     
     def get_skill_details(self, skill_id: int) -> Dict:
-        """Get detailed information about a skill"""
-        # Check if skill exists
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT id FROM learning_skills WHERE id = ?",
-            (skill_id,)
-        )
-        skill = cursor.fetchone()
+        """
+        Get detailed information about a skill
+        
+        Why one query:
+        - Skill row, item stats and recent sessions come back in one row
+        - Sessions are packed with json_group_array and decoded once here
+        - No row at all = the skill doesn't exist
+        """
+        cursor = self._reader().execute("""
+            SELECT s.*,
+                (SELECT json_object(
+                    'total_items', COUNT(*),
+                    'avg_confidence', AVG(confidence_level),
+                    'total_correct', SUM(times_correct),
+                    'total_reviews', SUM(times_reviewed))
+                 FROM learning_items WHERE skill_id = s.id) AS stats_json,
+                (SELECT json_group_array(json_object(
+                    'id', id,
+                    'skill_id', skill_id,
+                    'session_date', session_date,
+                    'duration_minutes', duration_minutes,
+                    'topics_covered', topics_covered,
+                    'understanding_level', understanding_level,
+                    'notes', notes,
+                    'key_takeaways', key_takeaways))
+                 FROM (SELECT * FROM learning_sessions
+                       WHERE skill_id = s.id
+                       ORDER BY session_date DESC
+                       LIMIT 5)) AS sessions_json
+            FROM learning_skills s
+            WHERE s.id = ?
+        """, (skill_id,))
+        row = cursor.fetchone()
 
-        if skill is None:
+        if row is None:
             # Skill doesn't exist!
             raise ValueError(f"Skill ID {skill_id} does not exist")
         
-        # Get skill info
-        cursor.execute("SELECT * FROM learning_skills WHERE id = ?", (skill_id,))
-        skill = dict(cursor.fetchone())
-        
-        # Get recent sessions
-        cursor.execute("""
-            SELECT * FROM learning_sessions 
-            WHERE skill_id = ? 
-            ORDER BY session_date DESC 
-            LIMIT 5
-        """, (skill_id,))
-        skill['recent_sessions'] = [dict(row) for row in cursor.fetchall()]
-        
-        # Get stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_items,
-                AVG(confidence_level) as avg_confidence,
-                SUM(times_correct) as total_correct,
-                SUM(times_reviewed) as total_reviews
-            FROM learning_items
-            WHERE skill_id = ?
-        """, (skill_id,))
-        skill['stats'] = dict(cursor.fetchone())
+        skill = dict(row)
+        skill['stats'] = json.loads(skill.pop('stats_json'))
+        skill['recent_sessions'] = json.loads(skill.pop('sessions_json'))
         
         return skill
     
@@ -291,69 +956,63 @@ class LearningTracker:
                     topics_covered: str, understanding_level: int,
                     notes: str = None, key_takeaways: str = None) -> int:
         """Log a learning session"""
-        cursor = self.conn.cursor()
-        #Check if skill exists
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT id FROM learning_skills WHERE id = ?",
-            (skill_id,)
-        )
-        skill = cursor.fetchone()
-
-        if skill is None:
-            # Skill doesn't exist!
-            raise ValueError(f"Skill ID {skill_id} does not exist")
-        
-        # Insert session
-        cursor.execute("""
-            INSERT INTO learning_sessions 
-            (skill_id, duration_minutes, topics_covered, understanding_level, notes, key_takeaways)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (skill_id, duration_minutes, topics_covered, understanding_level, notes, key_takeaways))
-        
-        # Update skill stats
-        cursor.execute("""
-            UPDATE learning_skills 
-            SET last_reviewed = CURRENT_TIMESTAMP,
-                next_review = ?,
-                total_time_minutes = total_time_minutes + ?
-            WHERE id = ?
-        """, (self._calculate_next_review(understanding_level), duration_minutes, skill_id))
-        
-        self.conn.commit()
-        return cursor.lastrowid
+        # Session row and skill stats land together or not at all
+        with self.transaction():
+            cursor = self.conn.cursor()
+            
+            # Insert session (the foreign key rejects unknown skills)
+            with self._check_skill_exists(skill_id):
+                cursor.execute("""
+                    INSERT INTO learning_sessions 
+                    (skill_id, duration_minutes, topics_covered, understanding_level, notes, key_takeaways)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (skill_id, duration_minutes, topics_covered, understanding_level, notes, key_takeaways))
+            session_id = cursor.lastrowid
+            
+            # Update skill stats
+            cursor.execute("""
+                UPDATE learning_skills 
+                SET last_reviewed = CURRENT_TIMESTAMP,
+                    next_review = datetime('now', ?),
+                    total_time_minutes = total_time_minutes + ?
+                WHERE id = ?
+            """, (self._calculate_next_review(understanding_level), duration_minutes, skill_id))
+        
+        return session_id
     
+    @serialized_write
     def add_learning_item(self, skill_id: int, answer: str,
                          question: str = None, item_type: str = 'concept',
                          difficulty: int = 3, tags: str = None,
                          source: str = None) -> int:
         """Add a learning item (concept, Q&A, fact, etc.)"""
-        # Check if skill exists
         cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT id FROM learning_skills WHERE id = ?",
-            (skill_id,)
-        )
-        skill = cursor.fetchone()
-
-        if skill is None:
-            # Skill doesn't exist!
-            raise ValueError(f"Skill ID {skill_id} does not exist")
-        
-        next_review = datetime.now() + timedelta(days=1)  # Review tomorrow
         
-        cursor.execute("""
-            INSERT INTO learning_items 
-            (skill_id, item_type, question, answer, difficulty, tags, source, next_review)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (skill_id, item_type, question, answer, difficulty, tags, source, next_review))
+        # The foreign key rejects unknown skills; review tomorrow
+        with self._check_skill_exists(skill_id):
+            cursor.execute("""
+                INSERT INTO learning_items 
+                (skill_id, item_type, question, answer, difficulty, tags, source, next_review)
+                VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now', '+1 day'))
+            """, (skill_id, item_type, question, answer, difficulty, tags, source))
         
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
     
     def get_items_due_for_review(self, skill_id: int = None, limit: int = 10) -> List[Dict]:
         """Get learning items due for review (spaced repetition)"""
-        cursor = self.conn.cursor()
+        return list(self.iter_items_due_for_review(skill_id, limit))
+    
+    def iter_items_due_for_review(self, skill_id: int = None,
+                                  limit: int = 10) -> Iterator[Dict]:
+        """
+        Yield items due for review as they are read (limit=-1: all)
+        
+        Rows are never all held in memory, so large queues start at once.
+        Use get_items_due_for_review to record reviews while looping:
+        rescheduling moves items within the index this cursor walks.
+        """
+        cursor = self._reader().cursor()
         
         if skill_id:
             cursor.execute("""
@@ -376,68 +1035,143 @@ class LearningTracker:
                 LIMIT ?
             """, (limit,))
         
-        return [dict(row) for row in cursor.fetchall()]
+        for row in cursor:
+            yield dict(row)
     
     def record_review(self, item_id: int, was_correct: bool, 
                      confidence_before: int, confidence_after: int,
                      time_taken_seconds: int = None):
-        """Record a review of a learning item"""
-        cursor = self.conn.cursor()
+        """Record a review of a learning item (rescheduled with SM-2)"""
+        params = self._review_params(item_id, was_correct, confidence_before,
+                                     confidence_after, time_taken_seconds)
+        
+        with self.transaction():
+            # Update item stats and schedule (no row = unknown item)
+            cursor = self.conn.execute(_REVIEW_UPDATE_SQL, params)
+            if cursor.rowcount == 0:
+                raise ValueError(f"Item ID {item_id} does not exist")
+            
+            # Insert review history
+            cursor.execute(_REVIEW_INSERT_SQL, params)
+    
+    def add_skills_bulk(self, skills: List[Dict]) -> int:
+        """
+        Add many skills in one transaction
         
-        # Insert review history
-        cursor.execute("""
-            INSERT INTO review_history 
-            (item_id, was_correct, confidence_before, confidence_after, time_taken_seconds)
-            VALUES (?, ?, ?, ?, ?)
-        """, (item_id, was_correct, confidence_before, confidence_after, time_taken_seconds))
+        Args:
+            skills: Dicts with add_skill's arguments (skill_name required)
         
-        # Update item stats
-        cursor.execute("""
-            UPDATE learning_items 
-            SET times_reviewed = times_reviewed + 1,
-                times_correct = times_correct + ?,
-                last_reviewed = CURRENT_TIMESTAMP,
-                next_review = ?,
-                confidence_level = ?
-            WHERE id = ?
-        """, (1 if was_correct else 0, 
-              self._calculate_next_review_for_item(was_correct, confidence_after),
-              confidence_after, item_id))
+        Returns: number of skills added (existing names are skipped)
+        """
+        with self.transaction():
+            cursor = self.conn.executemany("""
+                INSERT OR IGNORE INTO learning_skills 
+                (skill_name, category, difficulty, target_level, notes, next_review)
+                VALUES (?, ?, ?, ?, ?, datetime('now', '+1 day'))
+            """, [
+                (s['skill_name'], s.get('category'), s.get('difficulty', 'beginner'),
+                 s.get('target_level'), s.get('notes'))
+                for s in skills
+            ])
+        return cursor.rowcount
+    
+    def add_learning_items_bulk(self, items: List[Dict]) -> List[int]:
+        """
+        Add many learning items in one transaction
         
-        self.conn.commit()
+        Args:
+            items: Dicts with add_learning_item's arguments
+                   (skill_id and answer required)
+        
+        Returns: new item ids, in the order of items
+        
+        Raises: ValueError if any skill_id doesn't exist (nothing is added)
+        
+        Why ids from last_insert_rowid():
+        - executemany can't return rows (no RETURNING)
+        - The transaction holds the write lock from the first row on, so
+          one executemany gets consecutive ids ending at the last one
+        """
+        if not items:
+            return []
+        try:
+            with self.transaction():
+                # Review tomorrow
+                self.conn.executemany("""
+                    INSERT INTO learning_items 
+                    (skill_id, item_type, question, answer, difficulty, tags, source, next_review)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now', '+1 day'))
+                """, [
+                    (i['skill_id'], i.get('item_type', 'concept'), i.get('question'),
+                     i['answer'], i.get('difficulty', 3), i.get('tags'), i.get('source'))
+                    for i in items
+                ])
+                last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"Could not add learning items: {e}") from e
+        return list(range(last_id - len(items) + 1, last_id + 1))
     
-    def _calculate_next_review(self, understanding_level: int) -> datetime:
-        """Calculate next review date based on understanding"""
-        # Spaced repetition intervals
-        intervals = {
-            1: 1,   # Poor understanding: review tomorrow
-            2: 3,   # Below average: review in 3 days
-            3: 7,   # Average: review in 1 week
-            4: 14,  # Good: review in 2 weeks
-            5: 30   # Excellent: review in 1 month
-        }
-        days = intervals.get(understanding_level, 7)
-        return datetime.now() + timedelta(days=days)
+    def record_reviews_bulk(self, reviews: List[Dict]):
+        """
+        Record many reviews in one transaction
+        
+        Args:
+            reviews: Dicts with record_review's arguments
+        
+        Raises: ValueError if any item_id doesn't exist (nothing is recorded)
+        """
+        params = [self._review_params(**review) for review in reviews]
+        try:
+            with self.transaction():
+                self.conn.executemany(_REVIEW_UPDATE_SQL, params)
+                self.conn.executemany(_REVIEW_INSERT_SQL, params)
+        except sqlite3.IntegrityError as e:
+            if 'FOREIGN KEY' not in str(e):
+                raise
+            raise ValueError("Review for an item that does not exist") from e
     
-    def _calculate_next_review_for_item(self, was_correct: bool, confidence: int) -> datetime:
-        """Calculate next review for individual item"""
+    def _calculate_next_review(self, understanding_level: int) -> str:
+        """
+        Next review offset based on understanding, e.g. '+7 days'
+        
+        Returned as a SQLite date modifier: the statement computes
+        datetime('now', offset) itself, in the same UTC clock as the
+        CURRENT_TIMESTAMP it is compared against.
+        """
+        if 1 <= understanding_level <= 5:
+            return _SESSION_REVIEW_OFFSETS[understanding_level]
+        return '+7 days'
+    
+    @staticmethod
+    def _review_quality(was_correct: bool, confidence: int) -> int:
+        """
+        SM-2 quality grade for a review
+        
+        Correct: 3-5, higher when confident (confidence 1-3 -> 3)
+        Wrong: 2 (a lapse)
+        """
         if not was_correct:
-            return datetime.now() + timedelta(hours=4)  # Review soon
-        
-        # Increasing intervals based on confidence
-        intervals = {
-            1: 1,   # Low confidence: review tomorrow
-            2: 3,   # Some confidence: 3 days
-            3: 7,   # Moderate: 1 week
-            4: 14,  # Good: 2 weeks
-            5: 30   # High: 1 month
+            return 2
+        return min(5, max(3, confidence or 3))
+    
+    @classmethod
+    def _review_params(cls, item_id: int, was_correct: bool,
+                       confidence_before: int, confidence_after: int,
+                       time_taken_seconds: int = None) -> Dict:
+        """Named parameters for _REVIEW_UPDATE_SQL / _REVIEW_INSERT_SQL"""
+        return {
+            'id': item_id,
+            'was_correct': was_correct,
+            'correct': 1 if was_correct else 0,
+            'confidence_before': confidence_before,
+            'confidence': confidence_after,
+            'seconds': time_taken_seconds,
+            'quality': cls._review_quality(was_correct, confidence_after),
         }
-        days = intervals.get(confidence, 7)
-        return datetime.now() + timedelta(days=days)
     
     def get_daily_review_summary(self) -> Dict:
         """Get summary of items due today"""
-        cursor = self.conn.cursor()
+        cursor = self._reader().cursor()
         
         # Items due for review
         cursor.execute("""
@@ -456,15 +1190,15 @@ class LearningTracker:
         """)
         skills_due = cursor.fetchone()['count']
         
-        # Recent progress
+        # Recent progress (from the daily buckets)
         cursor.execute("""
             SELECT 
-                COUNT(*) as sessions_this_week,
-                SUM(duration_minutes) as minutes_this_week
-            FROM learning_sessions
-            WHERE session_date >= date('now', '-7 days')
+                SUM(sessions) as sessions_this_week,
+                SUM(minutes) as minutes_this_week
+            FROM daily_session_totals
+            WHERE day >= date('now', '-7 days')
         """)
-        progress = dict(cursor.fetchone())
+        progress = cursor.fetchone()
         
         return {
             'items_due_for_review': items_due,
@@ -474,8 +1208,30 @@ class LearningTracker:
         }
     
     def search_learning_items(self, query: str, skill_id: int = None) -> List[Dict]:
-        """Search through learning items"""
-        cursor = self.conn.cursor()
+        """
+        Search through learning items
+        
+        Each word in query matches as a prefix ("decor" finds "decorators"),
+        best matches (bm25) first. Falls back to a LIKE scan without FTS5
+        or when the query has no words.
+        """
+        cursor = self._reader().cursor()
+        match = self._fts_query(query)
+        
+        if match:
+            cursor.execute("""
+                SELECT li.*, ls.skill_name
+                FROM learning_items_fts f
+                JOIN learning_items li ON li.id = f.rowid
+                JOIN learning_skills ls ON li.skill_id = ls.id
+                WHERE learning_items_fts MATCH :match
+                  AND (:skill_id IS NULL OR li.skill_id = :skill_id)
+                  AND (:skill_id IS NOT NULL OR ls.status = 'active')
+                ORDER BY bm25(learning_items_fts), li.confidence_level ASC
+                LIMIT CASE WHEN :skill_id IS NULL THEN 20 ELSE -1 END
+            """, {'match': match, 'skill_id': skill_id or None})
+            return [dict(row) for row in cursor.fetchall()]
+        
         search_pattern = f"%{query}%"
         
         if skill_id:
@@ -500,20 +1256,20 @@ class LearningTracker:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    @serialized_write
     def add_milestone(self, skill_id: int, milestone: str, 
                      target_date: str = None, notes: str = None) -> int:
         """Add a learning milestone"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        cursor = self.conn.execute("""
             INSERT INTO learning_milestones (skill_id, milestone, target_date, notes)
             VALUES (?, ?, ?, ?)
         """, (skill_id, milestone, target_date, notes))
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
     
     def get_milestones(self, skill_id: int, include_completed: bool = False) -> List[Dict]:
         """Get milestones for a skill"""
-        cursor = self.conn.cursor()
+        cursor = self._reader().cursor()
         
         if include_completed:
             cursor.execute("""
@@ -530,48 +1286,52 @@ class LearningTracker:
         
         return [dict(row) for row in cursor.fetchall()]
     
+    @serialized_write
     def complete_milestone(self, milestone_id: int):
         """Mark a milestone as completed"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        self.conn.execute("""
             UPDATE learning_milestones
             SET completed = 1, completed_date = CURRENT_TIMESTAMP
             WHERE id = ?
         """, (milestone_id,))
-        self.conn.commit()
+        self._commit()
     
+    @_cached_read
     def get_learning_stats(self, days: int = 30) -> Dict:
-        """Get learning statistics for the past N days"""
-        cursor = self.conn.cursor()
+        """
+        Get learning statistics for the past N days
         
-        # Total time spent
-        cursor.execute("""
-            SELECT SUM(duration_minutes) as total_minutes
-            FROM learning_sessions
-            WHERE session_date >= date('now', ?)
+        One query over the daily buckets: sessions by skill (as JSON)
+        and review totals, with the period bound once.
+        """
+        cursor = self._reader().execute("""
+            WITH period AS (SELECT date('now', ?) AS since)
+            SELECT 
+                (SELECT json_group_array(json_object(
+                    'skill_name', skill_name,
+                    'session_count', session_count,
+                    'total_minutes', total_minutes))
+                 FROM (SELECT ls.skill_name,
+                              SUM(dst.sessions) as session_count,
+                              SUM(dst.minutes) as total_minutes
+                       FROM daily_session_totals dst
+                       JOIN learning_skills ls ON dst.skill_id = ls.id
+                       WHERE dst.day >= (SELECT since FROM period)
+                       GROUP BY ls.skill_name
+                       HAVING SUM(dst.sessions) > 0)) as by_skill_json,
+                COALESCE(SUM(reviews), 0) as total_reviews,
+                SUM(correct) as correct_reviews
+            FROM daily_review_totals
+            WHERE day >= (SELECT since FROM period)
         """, (f'-{days} days',))
-        total_minutes = cursor.fetchone()['total_minutes'] or 0
+        reviews = cursor.fetchone()
         
-        # Sessions by skill
-        cursor.execute("""
-            SELECT ls.skill_name, COUNT(*) as session_count, SUM(duration_minutes) as total_minutes
-            FROM learning_sessions lses
-            JOIN learning_skills ls ON lses.skill_id = ls.id
-            WHERE lses.session_date >= date('now', ?)
-            GROUP BY ls.skill_name
-            ORDER BY total_minutes DESC
-        """, (f'-{days} days',))
-        by_skill = [dict(row) for row in cursor.fetchall()]
+        # Sessions by skill, most time first
+        by_skill = json.loads(reviews['by_skill_json'])
+        by_skill.sort(key=lambda row: row['total_minutes'], reverse=True)
         
-        # Review accuracy
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_reviews,
-                SUM(CASE WHEN was_correct = 1 THEN 1 ELSE 0 END) as correct_reviews
-            FROM review_history
-            WHERE review_date >= date('now', ?)
-        """, (f'-{days} days',))
-        reviews = dict(cursor.fetchone())
+        # Total time spent
+        total_minutes = sum(row['total_minutes'] for row in by_skill)
         
         accuracy = 0
         if reviews['total_reviews'] > 0:
@@ -587,12 +1347,43 @@ class LearningTracker:
         }
     
     def close(self):
-        """Close database connection"""
-        if hasattr(self, 'conn') and self.conn:
-            self.conn.close()
+        """
+        Close database connections (safe to call twice, from any thread)
+        
+        Why optimize/checkpoint here:
+        - PRAGMA optimize refreshes planner statistics when they're stale
+        - wal_checkpoint(TRUNCATE) folds the WAL back into the database
+          once, so the next start doesn't replay it
+        
+        No __del__: closing from a finalizer at interpreter shutdown can
+        run after sqlite3 is torn down. Use close() or a with-block;
+        unclosed trackers only get a plain close from weakref.finalize.
+        """
+        self._finalizer.detach()
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+            conn, self.conn = self.conn, None
+        
+        for reader in readers:
+            reader.close()
+        
+        if conn is None:
+            return
+        try:
+            conn.execute("PRAGMA optimize")
+            if self._tune_pragmas and self.db_path != ":memory:":
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: Database maintenance on close failed: {e}")
+        finally:
+            conn.close()
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
     
-    def __del__(self):
-        """Cleanup on deletion"""
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
         self.close()
 
     # ===== CHALLENGE-BASED LEARNING METHODS =====
@@ -610,23 +1401,39 @@ class LearningTracker:
         - User can add their own project ideas
         - Flexible learning path
         """
-        import json
-        
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO learning_challenges 
-            (title, description, skill_id, difficulty, estimated_hours, 
-            skills_taught, prerequisites, unlocks)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            title, description, skill_id, difficulty, estimated_hours,
-            json.dumps(skills_taught),
-            json.dumps(prerequisites or []),
-            json.dumps(unlocks or [])
-        ))
+        lists = {
+            'skills_taught': skills_taught or [],
+            'prerequisites': prerequisites or [],
+            'unlocks': unlocks or [],
+        }
         
-        self.conn.commit()
-        return cursor.lastrowid
+        with self.transaction():
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                INSERT INTO learning_challenges 
+                (title, description, skill_id, difficulty, estimated_hours, 
+                skills_taught, prerequisites, unlocks)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                title, description, skill_id, difficulty, estimated_hours,
+                json.dumps(skills_taught),
+                json.dumps(lists['prerequisites']),
+                json.dumps(lists['unlocks'])
+            ))
+            challenge_id = cursor.lastrowid
+            
+            # Same lists, one row per entry (see _init_challenge_links)
+            cursor.executemany("""
+                INSERT INTO challenge_skill_links (challenge_id, relation, position, skill_name)
+                VALUES (?, ?, ?, ?)
+            """, [
+                (challenge_id, relation, position, str(name))
+                for column, relation in self._CHALLENGE_LIST_RELATIONS
+                for position, name in enumerate(lists[column])
+                if name is not None
+            ])
+        
+        return challenge_id
 
     def get_all_challenges(self, skill_id: int = None, status: str = None) -> list:
         """
@@ -637,35 +1444,41 @@ class LearningTracker:
         - View by status (what's in progress)
         - Overview of learning pipeline
         """
-        import json
-        
-        query = "SELECT * FROM learning_challenges WHERE 1=1"
-        params = []
-        
-        if skill_id:
-            query += " AND skill_id = ?"
-            params.append(skill_id)
-        
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        
-        query += " ORDER BY created_at DESC"
-        
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
+        # One fixed statement for every filter combination (NULL = no filter),
+        # so it is prepared once and then served from the statement cache
+        cursor = self._reader().cursor()
+        # The lists are grouped from challenge_skill_links by SQLite
+        cursor.execute("""
+            SELECT c.*,
+                (SELECT json_group_array(skill_name) FROM (
+                    SELECT skill_name FROM challenge_skill_links
+                    WHERE challenge_id = c.id AND relation = 'teaches'
+                    ORDER BY position)) AS teaches_json,
+                (SELECT json_group_array(skill_name) FROM (
+                    SELECT skill_name FROM challenge_skill_links
+                    WHERE challenge_id = c.id AND relation = 'requires'
+                    ORDER BY position)) AS requires_json,
+                (SELECT json_group_array(skill_name) FROM (
+                    SELECT skill_name FROM challenge_skill_links
+                    WHERE challenge_id = c.id AND relation = 'unlocks'
+                    ORDER BY position)) AS unlocks_json
+            FROM learning_challenges c
+            WHERE (:skill_id IS NULL OR c.skill_id = :skill_id)
+              AND (:status IS NULL OR c.status = :status)
+            ORDER BY c.created_at DESC
+        """, {'skill_id': skill_id or None, 'status': status or None})
         
         challenges = []
         for row in cursor.fetchall():
             challenge = dict(row)
-            # Parse JSON fields
-            challenge['skills_taught'] = json.loads(challenge['skills_taught']) if challenge['skills_taught'] else []
-            challenge['prerequisites'] = json.loads(challenge['prerequisites']) if challenge['prerequisites'] else []
-            challenge['unlocks'] = json.loads(challenge['unlocks']) if challenge['unlocks'] else []
+            challenge['skills_taught'] = json.loads(challenge.pop('teaches_json'))
+            challenge['prerequisites'] = json.loads(challenge.pop('requires_json'))
+            challenge['unlocks'] = json.loads(challenge.pop('unlocks_json'))
             challenges.append(challenge)
         
         return challenges
 
+    @serialized_write
     def start_challenge(self, challenge_id: int) -> bool:
         """
         Mark challenge as started AND generate Claude.ai prompt
@@ -675,8 +1488,6 @@ class LearningTracker:
         - Better UX (automatic prompt generation)
         - Encourages using Claude.ai for guidance
         """
-        from datetime import datetime
-        
         # 1. Generate and copy prompt FIRST (before updating status)
         prompt = self._generate_challenge_start_prompt(challenge_id)
         
@@ -699,21 +1510,21 @@ class LearningTracker:
             print("="*60)
         
         # 3. Update challenge status (original functionality)
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        cursor = self.conn.execute("""
             UPDATE learning_challenges
             SET status = 'in_progress',
-                started_at = ?,
+                started_at = CURRENT_TIMESTAMP,
                 start_prompt = ?
             WHERE id = ?
-        """, (datetime.now(), prompt, challenge_id))
+        """, (prompt, challenge_id))
         
-        self.conn.commit()
+        self._commit()
         
         input("\nPress Enter to continue...")
         
         return cursor.rowcount > 0
 
+    @serialized_write
     def update_challenge_progress(self, challenge_id: int, progress_percent: int,
                                 time_spent_minutes: int = 0, notes: str = None) -> bool:
         """
@@ -724,33 +1535,17 @@ class LearningTracker:
         - Motivating
         - Understand time investment
         """
-        cursor = self.conn.cursor()
-        
-        # Get current time spent
-        cursor.execute("SELECT time_spent FROM learning_challenges WHERE id = ?", (challenge_id,))
-        row = cursor.fetchone()
-        if not row:
-            return False
-        
-        current_time = row['time_spent'] or 0
-        new_time = current_time + time_spent_minutes
-        
-        update_query = """
+        # One fixed statement: SQLite adds the time itself, and empty
+        # notes (NULL or '') leave the existing notes alone
+        cursor = self.conn.execute("""
             UPDATE learning_challenges
-            SET progress_percent = ?,
-                time_spent = ?
-        """
-        params = [progress_percent, new_time]
-        
-        if notes:
-            update_query += ", notes = ?"
-            params.append(notes)
-        
-        update_query += " WHERE id = ?"
-        params.append(challenge_id)
-        
-        cursor.execute(update_query, params)
-        self.conn.commit()
+            SET progress_percent = :progress,
+                time_spent = COALESCE(time_spent, 0) + :minutes,
+                notes = COALESCE(NULLIF(:notes, ''), notes)
+            WHERE id = :id
+        """, {'progress': progress_percent, 'minutes': time_spent_minutes or 0,
+              'notes': notes, 'id': challenge_id})
+        self._commit()
         
         return cursor.rowcount > 0
 
@@ -764,44 +1559,38 @@ class LearningTracker:
         - GitHub link = portfolio evidence
         - Final notes = capture learnings
         """
-        from datetime import datetime
+        with self.transaction():
+            self._complete_challenge(challenge_id, github_link, final_notes)
         
+        return True
+    
+    def _complete_challenge(self, challenge_id: int, github_link: str,
+                            final_notes: str):
+        """complete_challenge's two writes (caller holds the transaction)"""
         cursor = self.conn.cursor()
         
-        update_query = """
+        # One fixed statement; an empty link/notes leaves the column alone
+        cursor.execute("""
             UPDATE learning_challenges
             SET status = 'completed',
-                completed_at = ?,
-                progress_percent = 100
-        """
-        params = [datetime.now()]
-        
-        if github_link:
-            update_query += ", github_link = ?"
-            params.append(github_link)
-        
-        if final_notes:
-            update_query += ", notes = COALESCE(notes || '\n\n', '') || ?"
-            params.append(f"Final notes: {final_notes}")
-        
-        update_query += " WHERE id = ?"
-        params.append(challenge_id)
-        
-        cursor.execute(update_query, params)
-        self.conn.commit()
-        
-        # Add skill evidence
-        cursor.execute("SELECT skill_id FROM learning_challenges WHERE id = ?", (challenge_id,))
-        row = cursor.fetchone()
-        if row:
-            cursor.execute("""
-                INSERT INTO skill_evidence (skill_id, challenge_id, evidence_type, description)
-                VALUES (?, ?, 'project_completed', 'Completed full challenge')
-            """, (row['skill_id'], challenge_id))
-            self.conn.commit()
-        
-        return True
+                completed_at = CURRENT_TIMESTAMP,
+                progress_percent = 100,
+                github_link = COALESCE(NULLIF(:github_link, ''), github_link),
+                notes = CASE WHEN COALESCE(:final_notes, '') = '' THEN notes
+                             ELSE COALESCE(notes || char(10) || char(10), '')
+                                  || 'Final notes: ' || :final_notes
+                        END
+            WHERE id = :id
+        """, {'github_link': github_link, 'final_notes': final_notes, 'id': challenge_id})
+        
+        # Add skill evidence (same transaction as the status change)
+        cursor.execute("""
+            INSERT INTO skill_evidence (skill_id, challenge_id, evidence_type, description)
+            SELECT skill_id, id, 'project_completed', 'Completed full challenge'
+            FROM learning_challenges WHERE id = ?
+        """, (challenge_id,))
 
+    @serialized_write
     def log_obstacle(self, challenge_id: int, description: str) -> int:
         """
         Log an obstacle encountered during a challenge
@@ -811,14 +1600,13 @@ class LearningTracker:
         - Track what blocks you
         - Build obstacle-solving library
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        cursor = self.conn.execute("""
             INSERT INTO challenge_obstacles
             (challenge_id, obstacle_description, status)
             VALUES (?, ?, 'blocking')
         """, (challenge_id, description))
         
-        self.conn.commit()
+        self._commit()
         return cursor.lastrowid
 
     def solve_obstacle(self, obstacle_id: int, solution: str, insight: str = None,
@@ -832,44 +1620,33 @@ class LearningTracker:
         - Time = track problem-solving skill growth
         - Resources = know what helps you learn
         """
-        from datetime import datetime
-        
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE challenge_obstacles
-            SET solution = ?,
-                insight = ?,
-                time_to_solve = ?,
-                resources_used = ?,
-                status = 'solved',
-                solved_at = ?
-            WHERE id = ?
-        """, (solution, insight, time_to_solve, resources_used, datetime.now(), obstacle_id))
-        
-        self.conn.commit()
-        
-        # Add skill evidence for obstacle overcome
-        cursor.execute("""
-            SELECT co.challenge_id, lc.skill_id
-            FROM challenge_obstacles co
-            JOIN learning_challenges lc ON co.challenge_id = lc.id
-            WHERE co.id = ?
-        """, (obstacle_id,))
-        
-        row = cursor.fetchone()
-        if row:
+        with self.transaction():
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                UPDATE challenge_obstacles
+                SET solution = ?,
+                    insight = ?,
+                    time_to_solve = ?,
+                    resources_used = ?,
+                    status = 'solved',
+                    solved_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (solution, insight, time_to_solve, resources_used, obstacle_id))
+            
+            # Add skill evidence for obstacle overcome (same transaction)
             cursor.execute("""
                 INSERT INTO skill_evidence (skill_id, challenge_id, evidence_type, description)
-                VALUES (?, ?, 'obstacle_overcome', ?)
-            """, (row['skill_id'], row['challenge_id'], solution[:200]))
-            self.conn.commit()
+                SELECT lc.skill_id, co.challenge_id, 'obstacle_overcome', ?
+                FROM challenge_obstacles co
+                JOIN learning_challenges lc ON co.challenge_id = lc.id
+                WHERE co.id = ?
+            """, (solution[:200], obstacle_id))
         
         return True
 
     def get_obstacles_for_challenge(self, challenge_id: int) -> list:
         """Get all obstacles for a specific challenge"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        cursor = self._reader().execute("""
             SELECT * FROM challenge_obstacles
             WHERE challenge_id = ?
             ORDER BY created_at DESC
@@ -885,9 +1662,24 @@ class LearningTracker:
         - "I've solved this before!"
         - Build personal Stack Overflow
         - Learn from past you
+        
+        Each word matches as a prefix in the description, solution or
+        insight, best matches first (LIKE scan without FTS5).
         """
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        match = self._fts_query(keyword)
+        if match:
+            cursor = self._reader().execute("""
+                SELECT co.*, lc.title as challenge_title, ls.skill_name
+                FROM challenge_obstacles_fts f
+                JOIN challenge_obstacles co ON co.id = f.rowid
+                JOIN learning_challenges lc ON co.challenge_id = lc.id
+                JOIN learning_skills ls ON lc.skill_id = ls.id
+                WHERE challenge_obstacles_fts MATCH ?
+                ORDER BY bm25(challenge_obstacles_fts), co.solved_at DESC
+            """, (match,))
+            return [dict(row) for row in cursor.fetchall()]
+        
+        cursor = self._reader().execute("""
             SELECT co.*, lc.title as challenge_title, ls.skill_name
             FROM challenge_obstacles co
             JOIN learning_challenges lc ON co.challenge_id = lc.id
@@ -898,6 +1690,7 @@ class LearningTracker:
         
         return [dict(row) for row in cursor.fetchall()]
 
+    @serialized_write
     def log_daily_streak(self, minutes_worked: int, challenge_id: int = None,
                         obstacles_encountered: int = 0, obstacles_solved: int = 0,
                         notes: str = None) -> bool:
@@ -909,37 +1702,25 @@ class LearningTracker:
         - Track streaks
         - See patterns in productivity
         """
-        from datetime import date
-        
-        cursor = self.conn.cursor()
-        
-        # Check if today already logged
-        cursor.execute("SELECT id FROM daily_streaks WHERE date = ?", (date.today(),))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing
-            cursor.execute("""
-                UPDATE daily_streaks
-                SET minutes_worked = minutes_worked + ?,
-                    obstacles_encountered = obstacles_encountered + ?,
-                    obstacles_solved = obstacles_solved + ?,
-                    notes = COALESCE(notes || '\n', '') || COALESCE(?, '')
-                WHERE date = ?
-            """, (minutes_worked, obstacles_encountered, obstacles_solved, notes, date.today()))
-        else:
-            # Insert new
-            cursor.execute("""
-                INSERT INTO daily_streaks
-                (date, minutes_worked, challenge_worked_on, obstacles_encountered, 
-                obstacles_solved, notes)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (date.today(), minutes_worked, challenge_id, obstacles_encountered,
-                obstacles_solved, notes))
-        
-        self.conn.commit()
+        # One UPSERT on the UNIQUE date column: insert today's row, or add
+        # to it if today is already logged
+        self.conn.execute("""
+            INSERT INTO daily_streaks
+            (date, minutes_worked, challenge_worked_on, obstacles_encountered, 
+            obstacles_solved, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                minutes_worked = minutes_worked + excluded.minutes_worked,
+                obstacles_encountered = obstacles_encountered + excluded.obstacles_encountered,
+                obstacles_solved = obstacles_solved + excluded.obstacles_solved,
+                notes = COALESCE(notes || char(10), '') || COALESCE(excluded.notes, '')
+        """, (date.today().isoformat(), minutes_worked, challenge_id,
+              obstacles_encountered, obstacles_solved, notes))
+        
+        self._commit()
         return True
 
+    @_cached_read
     def get_streak_stats(self) -> dict:
         """
         Get streak statistics
@@ -951,56 +1732,34 @@ class LearningTracker:
         - Visible progress
         - Don't break the chain!
         """
-        from datetime import date, timedelta
-        
-        cursor = self.conn.cursor()
-        
-        # Get all streak days
-        cursor.execute("""
-            SELECT date FROM daily_streaks
-            WHERE maintained_streak = 1
-            ORDER BY date DESC
-        """)
-        
-        dates = [row['date'] for row in cursor.fetchall()]
-        
-        if not dates:
-            return {'current_streak': 0, 'longest_streak': 0, 'total_days': 0}
-        
-        # Calculate current streak
-        current_streak = 0
-        check_date = date.today()
-        
-        for streak_date in dates:
-            if isinstance(streak_date, str):
-                streak_date = date.fromisoformat(streak_date)
-            
-            if streak_date == check_date:
-                current_streak += 1
-                check_date -= timedelta(days=1)
-            else:
-                break
-        
-        # Calculate longest streak
-        longest_streak = 1
-        current_run = 1
-        
-        for i in range(len(dates) - 1):
-            date1 = date.fromisoformat(dates[i]) if isinstance(dates[i], str) else dates[i]
-            date2 = date.fromisoformat(dates[i+1]) if isinstance(dates[i+1], str) else dates[i+1]
-            
-            if (date1 - date2).days == 1:
-                current_run += 1
-                longest_streak = max(longest_streak, current_run)
-            else:
-                current_run = 1
+        # Gaps and islands: consecutive days share julianday(date) - row
+        # number, so each run of days is one group. The current streak is
+        # the run ending today (local date, as log_daily_streak stores it).
+        row = self._reader().execute("""
+            WITH days AS (
+                SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS run
+                FROM daily_streaks
+                WHERE maintained_streak = 1
+            ),
+            runs AS (
+                SELECT COUNT(*) AS length, MAX(date) AS last_day
+                FROM days
+                GROUP BY run
+            )
+            SELECT 
+                COALESCE((SELECT length FROM runs WHERE last_day = :today), 0) as current_streak,
+                COALESCE(MAX(length), 0) as longest_streak,
+                COALESCE(SUM(length), 0) as total_days
+            FROM runs
+        """, {'today': date.today().isoformat()}).fetchone()
         
         return {
-            'current_streak': current_streak,
-            'longest_streak': longest_streak,
-            'total_days': len(dates)
+            'current_streak': row['current_streak'],
+            'longest_streak': row['longest_streak'],
+            'total_days': row['total_days']
         }
 
+    @_cached_read
     def get_skill_progression(self, skill_id: int) -> dict:
         """
         Get skill progression based on challenges completed
@@ -1012,68 +1771,46 @@ class LearningTracker:
         - Obstacles overcome = depth
         - Clear progression path
         """
-        cursor = self.conn.cursor()
-        
-        # Get challenges for this skill
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_challenges,
-                SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
-                SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END) as in_progress,
-                SUM(time_spent) as total_minutes
-            FROM learning_challenges
-            WHERE skill_id = ?
-        """, (skill_id,))
-        
-        challenge_stats = dict(cursor.fetchone())
-        
-        # Get obstacles for this skill
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_obstacles,
-                SUM(CASE WHEN co.status = 'solved' THEN 1 ELSE 0 END) as solved_obstacles
-            FROM challenge_obstacles co
-            JOIN learning_challenges lc ON co.challenge_id = lc.id
-            WHERE lc.skill_id = ?
-        """, (skill_id,))
-        
-        obstacle_stats = dict(cursor.fetchone())
-        
-        # Get skill evidence
-        cursor.execute("""
-            SELECT COUNT(*) as evidence_count
-            FROM skill_evidence
-            WHERE skill_id = ?
-        """, (skill_id,))
-        
-        evidence = cursor.fetchone()['evidence_count']
-        
-        # Calculate competency level (simple heuristic)
-        completed = challenge_stats['completed'] or 0
-        
-        if completed >= 10:
-            level = 'advanced'
-            percent = 90
-        elif completed >= 5:
-            level = 'intermediate'
-            percent = 70
-        elif completed >= 2:
-            level = 'beginner+'
-            percent = 50
-        elif completed >= 1:
-            level = 'beginner'
-            percent = 30
-        else:
-            level = 'just_starting'
-            percent = 10
-        
-        return {
-            **challenge_stats,
-            **obstacle_stats,
-            'evidence_count': evidence,
-            'competency_level': level,
-            'competency_percent': percent
-        }
+        # Challenge, obstacle and evidence counts and the competency level
+        # (a simple heuristic on completed challenges) in one statement
+        row = self._reader().execute("""
+            WITH challenges AS (
+                SELECT 
+                    COUNT(*) as total_challenges,
+                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
+                    SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END) as in_progress,
+                    SUM(time_spent) as total_minutes
+                FROM learning_challenges
+                WHERE skill_id = :skill_id
+            ),
+            obstacles AS (
+                SELECT 
+                    COUNT(*) as total_obstacles,
+                    SUM(CASE WHEN co.status = 'solved' THEN 1 ELSE 0 END) as solved_obstacles
+                FROM challenge_obstacles co
+                JOIN learning_challenges lc ON co.challenge_id = lc.id
+                WHERE lc.skill_id = :skill_id
+            ),
+            evidence AS (
+                SELECT COUNT(*) as evidence_count
+                FROM skill_evidence
+                WHERE skill_id = :skill_id
+            )
+            SELECT *,
+                CASE WHEN completed >= 10 THEN 'advanced'
+                     WHEN completed >= 5 THEN 'intermediate'
+                     WHEN completed >= 2 THEN 'beginner+'
+                     WHEN completed >= 1 THEN 'beginner'
+                     ELSE 'just_starting' END as competency_level,
+                CASE WHEN completed >= 10 THEN 90
+                     WHEN completed >= 5 THEN 70
+                     WHEN completed >= 2 THEN 50
+                     WHEN completed >= 1 THEN 30
+                     ELSE 10 END as competency_percent
+            FROM challenges, obstacles, evidence
+        """, {'skill_id': skill_id}).fetchone()
+        
+        return dict(row)
 
     def get_recommended_challenge(self, skill_id: int) -> dict:
         """
@@ -1086,9 +1823,7 @@ class LearningTracker:
             'skill_gap': "What you'll learn"
         }
         """
-        import json
-        
-        cursor = self.conn.cursor()
+        cursor = self._reader().cursor()
         
         # Get completed challenges for this skill
         cursor.execute("""
@@ -1131,7 +1866,7 @@ class LearningTracker:
             ORDER BY created_at ASC
         """, (skill_id, target_difficulty))
         
-        available_challenges = [dict(row) for row in cursor.fetchall()]
+        available_challenges = cursor.fetchall()
         
         if not available_challenges:
             # Try next difficulty up
@@ -1148,7 +1883,7 @@ class LearningTracker:
                 ORDER BY created_at ASC
             """, (skill_id, target_difficulty))
             
-            available_challenges = [dict(row) for row in cursor.fetchall()]
+            available_challenges = cursor.fetchall()
         
         if not available_challenges:
             return None
@@ -1232,7 +1967,7 @@ class LearningTracker:
             skill_gap = f"Reinforces: {', '.join(skills_taught[:3])}"
         
         return {
-            'challenge': best_challenge,
+            'challenge': dict(best_challenge),  # Only the winner is copied
             'reason': best_reason,
             'unlocks': unlocks,
             'skill_gap': skill_gap,
@@ -1249,9 +1984,7 @@ class LearningTracker:
             ...
         ]
         """
-        import json
-        
-        cursor = self.conn.cursor()
+        cursor = self._reader().cursor()
         
         # Get all challenges for this skill
         cursor.execute("""
@@ -1320,7 +2053,7 @@ class LearningTracker:
 
     def _generate_challenge_start_prompt(self, challenge_id):
         """Generate starter prompt for Claude.ai"""
-        cursor = self.conn.cursor() # TODO: the skill Ids are skillid + 1 need to fix for all challenges
+        cursor = self._reader().cursor() # TODO: the skill Ids are skillid + 1 need to fix for all challenges
         challenge = cursor.execute("""
             SELECT lc.*, ls.skill_name as skill_name, ls.current_level
             FROM learning_challenges lc
@@ -1369,13 +2102,12 @@ class LearningTracker:
 
     def _copy_to_clipboard(self, text):
         """Copy text to clipboard (Windows)"""
+        if pyperclip is None:
+            print("\n⚠️  pyperclip not installed. Run: pip install pyperclip")
+            return False
         try:
-            import pyperclip
             pyperclip.copy(text)
             return True
-        except ImportError:
-            print("\n⚠️  pyperclip not installed. Run: pip install pyperclip")
-            return False
         except Exception as e:
             print(f"\n⚠️  Clipboard copy failed: {e}")
             return False
@@ -1404,12 +2136,13 @@ class LearningTracker:
             print("="*60)
         
         # Update challenge status
-        self.cursor.execute("""
-            UPDATE learning_challenges 
-            SET status = 'in_progress', started_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (challenge_id,))
-        self.conn.commit()
+        with self._write_lock:
+            self.cursor.execute("""
+                UPDATE learning_challenges 
+                SET status = 'in_progress', started_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (challenge_id,))
+            self._commit()
         
         input("\nPress Enter to continue...")
 
@@ -1417,7 +2150,7 @@ class LearningTracker:
         """View and copy saved challenge prompt"""
         
         # Get challenges with saved prompts
-        cursor = self.conn.cursor()
+        cursor = self._reader().cursor()
         challenges = cursor.execute("""
             SELECT id, title, status, start_prompt
             FROM learning_challenges
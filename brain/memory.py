@@ -1,33 +1,156 @@
 """Persistent memory system with semantic search"""
 
+import hashlib
 import json
+import re
+import time
 import sqlite3
-from datetime import datetime
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Dict, Optional
-import chromadb
-from chromadb.config import Settings
+from typing import List, Dict, Optional, Tuple
+from .learning_tracker import (
+    BUSY_TIMEOUT_SECONDS, SQLITE_PRAGMAS, create_fts_index, fts_match,
+    serialized_write
+)
+
+# Process-wide pool for the parallel ChromaDB queries in search_context,
+# so each chat turn doesn't pay for spinning up fresh threads
+_SEARCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="memory-search")
+
+# Question/filler words dropped from auto-extracted conversation topics
+_TOPIC_STOPWORDS = re.compile(
+    r'\b(?:what|how|why|when|where|can you|please|help me)\b', re.IGNORECASE
+)
+
+
+def _timestamp_us(moment: datetime) -> int:
+    """Unix time in whole microseconds (exact, unlike timestamp() * 1e6)
+    
+    Zero-padded to 16 digits in ids, so ids sort in time order.
+    """
+    return int(moment.timestamp()) * 1_000_000 + moment.microsecond
+
+
+def _close_memory(pending_vectors: Dict, collections: Dict, io_pool: ThreadPoolExecutor,
+                  conn: sqlite3.Connection, readers: list):
+    """Finalizer for a Memory (holds no reference to it)
+    
+    Runs from close(), when an unclosed Memory is garbage collected, or at
+    interpreter exit, so buffered fact/file vectors still reach ChromaDB.
+    """
+    io_pool.shutdown(wait=True)  # Queued conversation saves and batches
+    
+    for name, entries in pending_vectors.items():
+        collection = collections.get(name)
+        if not entries or collection is None:
+            continue
+        try:
+            collection.add(
+                ids=[entry_id for entry_id, _, _ in entries],
+                documents=[document for _, document, _ in entries],
+                metadatas=[metadata for _, _, metadata in entries]
+            )
+        except Exception as e:
+            print(f"⚠️ Warning: Failed to add {len(entries)} item(s) "
+                  f"to vector DB ({name}): {e}")
+        entries.clear()
+    
+    for reader in readers:
+        reader.close()
+    readers.clear()
+    conn.close()
+
+
+def _timed_vector_flush(memory_ref: weakref.ref):
+    """Timer callback: hand a Memory's partial vector batches to its I/O thread
+    
+    Holds only a weak reference, so a pending timer doesn't keep an
+    otherwise unused Memory alive.
+    """
+    memory = memory_ref()
+    if memory is not None:
+        memory._submit_pending_vectors()
+
+
+def _normalize_query(query: str) -> str:
+    """Search cache key text: "What is X?" and "what is  x?" share a key"""
+    return " ".join(query.lower().split())
 
 
 class Memory:
     """Persistent memory with semantic search"""
     
+    SEARCH_CACHE_SIZE = 256
+    SEARCH_CACHE_TTL = 300  # Seconds; other processes can write the same stores
+    EMBEDDING_CACHE_SIZE = 1024
+    VECTOR_BATCH_SIZE = 128  # Buffered facts/files per ChromaDB add
+    VECTOR_FLUSH_SECONDS = 0.5  # Longest a partial batch waits for its add
+    
     def __init__(self, db_path: str = "brain/knowledge.db", 
                  embeddings_path: str = "brain/embeddings"):
         # Use absolute paths to avoid issues with working directory
         self.db_path = Path(db_path).absolute()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # SQLite for structured data
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        # SQLite for structured data: the writer connection, also used for
+        # reads on the creating thread. Tables exist before any reader opens.
+        self.conn = self._connect()
         self._init_db()
         
+        # Read connections for other threads, one each (see _reader)
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        
+        # > 0 while inside transaction(): writes skip their own commit
+        self._transaction_depth = 0
+        self._transaction_thread = None  # Thread whose transaction() is open
+        # Held for a whole transaction() and each single write (see serialized_write)
+        self._write_lock = threading.RLock()
+        
+        # Fact/file vectors waiting for one batched ChromaDB add:
+        # collection attribute -> [(id, document, metadata), ...]
+        self._pending_vectors = {'facts': [], 'files': []}
+        self._vectors_lock = threading.Lock()
+        self._flush_timer = None  # Started when a batch starts filling
+        
+        # LRU of search_context and per-collection query results, keyed on
+        # the normalized query. _search_version is bumped on every write
+        # that could change them.
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_version = 0
+        
+        # LRU of query embeddings (sha256 of the text -> vector); unlike
+        # search results these never go stale
+        self._embedding_cache = OrderedDict()
+        self._embedding_cache_lock = threading.Lock()
+        
+        # Conversation saves and full vector batches run here, one at a
+        # time, in submission order (see _submit_io)
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-io")
+        self._io_lock = threading.Lock()
+        self._io_future = None  # Most recently queued job
+        self._vectors_future = None  # Most recently queued vector batch
+        
+        # Set once old conversations have their "date" metadata
+        self._conversation_dates_checked = False
+        
         # ChromaDB for semantic search (PERSISTENT!)
         embeddings_path_str = str(Path(embeddings_path).absolute())
         Path(embeddings_path_str).mkdir(parents=True, exist_ok=True)
         
         try:
+            # Imported here: chromadb pulls in numpy/onnxruntime/hnswlib, and
+            # importing this module shouldn't pay for that
+            import chromadb
             self.chroma_client = chromadb.PersistentClient(path=embeddings_path_str)
             
             # Collections
@@ -42,6 +165,56 @@ class Memory:
             self.facts = None
             self.conversations = None
             self.files = None
+        
+        # Not atexit.register(self._flush_vectors) or __del__: the atexit
+        # reference kept every Memory alive until exit. The finalizer holds
+        # only what it has to flush and close.
+        self._finalizer = weakref.finalize(
+            self, _close_memory, self._pending_vectors,
+            {'facts': self.facts, 'files': self.files},
+            self._io_pool, self.conn, self._readers
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (same file and pragmas as LearningTracker)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT_SECONDS,
+                               check_same_thread=False)
+        # WAL + synchronous=NORMAL: a fact/goal/preference commit appends to
+        # the WAL instead of fsyncing a rollback journal
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(pragma)
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: Could not tune SQLite settings: {e}")
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Connection for read-only queries
+        
+        Why per-thread readers:
+        - With WAL, readers on their own connections don't queue behind
+          each other on one connection's mutex, or behind the writer
+        - The thread inside transaction() uses the writer, so its reads see
+          its own pending writes; so does the creating thread when no other
+          thread has a transaction open
+        - Every other thread reads committed data only, never another
+          thread's half-done transaction
+        """
+        current = threading.get_ident()
+        transaction_thread = self._transaction_thread
+        if transaction_thread == current or (
+                transaction_thread is None and current == self._owner_thread):
+            return self.conn
+        
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
     
     def _init_db(self):
         """Initialize database tables"""
@@ -72,7 +245,7 @@ class Memory:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT UNIQUE NOT NULL,
                 status TEXT DEFAULT 'active',
-                metadata TEXT,
+                metadata TEXT CHECK (metadata IS NULL OR json_valid(metadata)),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -98,8 +271,193 @@ class Memory:
             CREATE INDEX IF NOT EXISTS idx_goals_status ON goals(status)
         """)
         
+        # Full-text index for the SQL fallback search (facts_fts, kept in
+        # sync by triggers); without FTS5 the fallback scans with LIKE
+        try:
+            create_fts_index(cursor, 'facts', ('entity', 'fact', 'context'))
+            self._has_fts = True
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Warning: FTS5 unavailable, fact search will scan rows ({e})")
+            self._has_fts = False
+        
         self.conn.commit()
     
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into one transaction (one commit, one fsync)
+        
+        Usage:
+            with memory.transaction():
+                for entity, fact in facts:
+                    memory.remember_fact(entity, fact)
+        
+        Why this approach:
+        - remember_fact/add_goal/save_preference normally commit on their own
+        - Inside this block they skip that commit; the block commits once
+        - New facts reach ChromaDB only after the commit, so a rollback
+          leaves no orphaned vectors
+        - Nested blocks simply join the outer transaction
+        - The write lock is held throughout, so another thread's writes
+          wait for the commit instead of joining (or being rolled back
+          with) this transaction
+        """
+        with self._write_lock:
+            outermost = self._transaction_depth == 0
+            if outermost:
+                if self.conn.in_transaction:
+                    self.conn.commit()  # Don't fold earlier pending writes into ours
+                self._flush_vectors()  # A rollback then only drops this block's
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._transaction_thread = threading.get_ident()
+            
+            self._transaction_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if outermost:
+                    self.conn.rollback()
+                    self._transaction_thread = None
+                    with self._vectors_lock:
+                        self._pending_vectors['facts'].clear()
+                raise
+            
+            self._transaction_depth -= 1
+            if outermost:
+                self.conn.commit()
+                self._transaction_thread = None
+    
+    def _commit(self):
+        """Commit now, unless this thread's transaction() block will commit for us"""
+        if self._transaction_thread != threading.get_ident():
+            self.conn.commit()
+    
+    def _queue_vectors(self, name: str, entries: List[Tuple[str, str, Dict]]):
+        """
+        Buffer (id, document, metadata) entries for the facts/files collection
+        
+        Why buffer:
+        - ChromaDB pays per add() call (embedding batch + HNSW insert)
+        - A full batch (VECTOR_BATCH_SIZE) is added on the I/O thread, so
+          the caller doesn't wait for its embedding
+        - A partial batch goes in after VECTOR_FLUSH_SECONDS, or sooner when
+          a search, flush() or close() needs it
+        
+        Why the timer:
+        - A process that only writes (the file watcher) never searches, so
+          its vectors would otherwise wait for exit, invisible to other
+          processes and lost on a crash
+        """
+        batch = None
+        with self._vectors_lock:
+            pending = self._pending_vectors[name]
+            pending.extend(entries)
+            # Not inside our transaction(): its entries wait for the commit
+            if (len(pending) >= self.VECTOR_BATCH_SIZE
+                    and self._transaction_thread != threading.get_ident()):
+                batch = pending
+                self._pending_vectors[name] = []
+            else:
+                self._start_flush_timer()
+        
+        if batch:
+            self._submit_vectors(name, batch)
+    
+    def _start_flush_timer(self):
+        """Schedule a timed flush unless one is pending (call with _vectors_lock)"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(
+                self.VECTOR_FLUSH_SECONDS, _timed_vector_flush, (weakref.ref(self),)
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _submit_pending_vectors(self):
+        """Timer thread: queue every partial batch for the I/O thread"""
+        batches = []
+        with self._vectors_lock:
+            self._flush_timer = None
+            if self._transaction_depth:
+                # Uncommitted facts: look again once the block is likely done
+                self._start_flush_timer()
+                return
+            for name, pending in self._pending_vectors.items():
+                if pending:
+                    batches.append((name, pending))
+                    self._pending_vectors[name] = []
+        
+        for name, batch in batches:
+            self._submit_vectors(name, batch)
+    
+    def _submit_vectors(self, name: str, batch: List[Tuple[str, str, Dict]]):
+        """Add a batch on the I/O thread; searches wait for it (_flush_vectors)"""
+        future = self._submit_io(self._add_vectors, name, batch)
+        if future is not None:
+            self._vectors_future = future
+    
+    def _flush_vectors(self, name: str = None):
+        """Add buffered entries to ChromaDB, one add() per collection
+        
+        Also waits for a full batch still being added on the I/O thread,
+        so searches see every write made before them.
+        No-op inside transaction(): its facts aren't committed yet.
+        """
+        future = self._vectors_future
+        if future is not None:
+            future.result()
+        
+        if self._transaction_depth:
+            return
+        
+        for collection_name in ([name] if name else list(self._pending_vectors)):
+            if not self._pending_vectors[collection_name]:
+                continue
+            
+            with self._vectors_lock:
+                pending = self._pending_vectors[collection_name]
+                self._pending_vectors[collection_name] = []
+            if not pending:
+                continue  # Another thread flushed it first
+            
+            self._add_vectors(collection_name, pending)
+    
+    def _add_vectors(self, name: str, entries: List[Tuple[str, str, Dict]]):
+        """One ChromaDB add() for (id, document, metadata) entries"""
+        collection = getattr(self, name)
+        if self.chroma_available and collection:
+            try:
+                collection.add(
+                    ids=[entry_id for entry_id, _, _ in entries],
+                    documents=[document for _, document, _ in entries],
+                    metadatas=[metadata for _, _, metadata in entries]
+                )
+            except Exception as e:
+                print(f"⚠️ Warning: Failed to add {len(entries)} item(s) "
+                      f"to vector DB ({name}): {e}")
+        
+        self._invalidate_search_cache()
+    
+    def _submit_io(self, fn, *args):
+        """Run fn(*args) on the I/O thread (inline once closed)
+        
+        Returns the job's future, or None if it already ran inline.
+        """
+        try:
+            with self._io_lock:
+                self._io_future = self._io_pool.submit(fn, *args)
+                return self._io_future
+        except RuntimeError:
+            # Already closed: run it here rather than drop it
+            fn(*args)
+            return None
+    
+    @staticmethod
+    def _fact_vector(fact_id: int, entity: str, fact: str, context: Optional[str]):
+        """A fact as a (id, document, metadata) vector entry"""
+        return f"fact_{fact_id}", fact, {"entity": entity, "context": context or ""}
+    
+    @serialized_write
     def remember_fact(self, entity: str, fact: str, context: str = None) -> int:
         """Remember a fact about an entity"""
         try:
@@ -108,25 +466,51 @@ class Memory:
                 "INSERT INTO facts (entity, fact, context) VALUES (?, ?, ?)",
                 (entity, fact, context)
             )
-            self.conn.commit()
+            self._commit()
             fact_id = cursor.lastrowid
             
-            # Add to vector DB if available
-            if self.chroma_available and self.facts:
-                try:
-                    self.facts.add(
-                        documents=[fact],
-                        metadatas=[{"entity": entity, "context": context or ""}],
-                        ids=[f"fact_{fact_id}"]
-                    )
-                except Exception as e:
-                    print(f"⚠️ Warning: Failed to add fact to vector DB: {e}")
-            
+            # Add to vector DB (batched, see _queue_vectors)
+            self._queue_vectors('facts', [self._fact_vector(fact_id, entity, fact, context)])
             return fact_id
         except sqlite3.Error as e:
             print(f"❌ Error saving fact: {e}")
             raise
     
+    def remember_facts(self, facts: List[Tuple]) -> List[int]:
+        """
+        Remember many facts in one transaction
+        
+        Args:
+            facts: (entity, fact) or (entity, fact, context) tuples
+        
+        Returns: new fact ids, in the order of facts
+        
+        Why ids from last_insert_rowid():
+        - executemany can't return rows
+        - The transaction holds the write lock, so one executemany gets
+          consecutive ids ending at the last one
+        """
+        rows = [(entity, fact, rest[0] if rest else None)
+                for entity, fact, *rest in facts]
+        if not rows:
+            return []
+        
+        try:
+            with self.transaction():
+                self.conn.executemany(
+                    "INSERT INTO facts (entity, fact, context) VALUES (?, ?, ?)",
+                    rows
+                )
+                last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                fact_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+                self._queue_vectors('facts', [
+                    self._fact_vector(fact_id, *row) for fact_id, row in zip(fact_ids, rows)
+                ])
+            return fact_ids
+        except sqlite3.Error as e:
+            print(f"❌ Error saving facts: {e}")
+            raise
+    
     def recall(self, query: str, n_results: int = 5) -> List[Dict]:
         """Semantic search across all memories"""
         if not self.chroma_available or not self.facts:
@@ -134,29 +518,34 @@ class Memory:
             return self._sql_search_facts(query, n_results)
         
         try:
-            results = self.facts.query(
-                query_texts=[query],
-                n_results=n_results
-            )
-            
-            memories = []
-            if results['documents'] and results['documents'][0]:
-                for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
-                    memories.append({
-                        'fact': doc,
-                        'entity': metadata.get('entity'),
-                        'context': metadata.get('context')
-                    })
+            self._flush_vectors('facts')
+            results = self._query_collection(self.facts, query, n_results)
             
-            return memories
+            if not results['documents']:
+                return []
+            return [
+                {'fact': doc, 'entity': metadata.get('entity'), 'context': metadata.get('context')}
+                for doc, metadata in zip(results['documents'][0], results['metadatas'][0])
+            ]
         except Exception as e:
             print(f"⚠️ Warning: Semantic search failed, falling back to SQL: {e}")
             return self._sql_search_facts(query, n_results)
     
     def _sql_search_facts(self, query: str, limit: int = 5) -> List[Dict]:
-        """Fallback SQL-based search"""
+        """Fallback SQL-based search (FTS5 word-prefix match, best first)"""
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
+            match = fts_match(query) if self._has_fts else None
+            if match:
+                cursor.execute(
+                    """SELECT f.entity, f.fact, f.context FROM facts_fts x
+                       JOIN facts f ON f.id = x.rowid
+                       WHERE facts_fts MATCH ?
+                       ORDER BY bm25(facts_fts), f.created_at DESC LIMIT ?""",
+                    (match, limit)
+                )
+                return [dict(row) for row in cursor.fetchall()]
+            
             query_pattern = f"%{query}%"
             cursor.execute(
                 """SELECT entity, fact, context FROM facts 
@@ -165,14 +554,7 @@ class Memory:
                 (query_pattern, query_pattern, limit)
             )
             
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'fact': row['fact'],
-                    'entity': row['entity'],
-                    'context': row['context']
-                })
-            return results
+            return [dict(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             print(f"❌ Error in SQL search: {e}")
             return []
@@ -180,7 +562,7 @@ class Memory:
     def get_recent_facts(self, limit: int = 10) -> List[Dict]:
         """Get most recent facts"""
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 "SELECT entity, fact, context FROM facts ORDER BY created_at DESC LIMIT ?",
                 (limit,)
@@ -190,10 +572,179 @@ class Memory:
             print(f"❌ Error getting recent facts: {e}")
             return []
     
+    def get_profile_context(self, n_facts: int = 10, n_goals: int = 5) -> Dict:
+        """Recent facts, active goals and writing style in one SQL round-trip
+        
+        Returns: {'recent_facts': [...], 'goals': [...], 'writing_style': str|None}
+        
+        Query-independent, so callers can cache it between messages.
+        """
+        context = {'recent_facts': [], 'goals': [], 'writing_style': None}
+        
+        try:
+            cursor = self._reader().cursor()
+            cursor.execute("""
+                SELECT * FROM (
+                    SELECT 'fact' AS kind, entity AS a, fact AS b, context AS c, created_at
+                    FROM facts ORDER BY created_at DESC LIMIT ?
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT 'goal', goal, deadline, NULL, created_at
+                    FROM goals WHERE status = 'active' ORDER BY created_at DESC LIMIT ?
+                )
+                UNION ALL
+                SELECT 'preference', key, value, NULL, updated_at
+                FROM preferences WHERE key = 'writing_style'
+                ORDER BY kind, created_at DESC
+            """, (n_facts, n_goals))
+            
+            for row in cursor.fetchall():
+                if row['kind'] == 'fact':
+                    context['recent_facts'].append(
+                        {'entity': row['a'], 'fact': row['b'], 'context': row['c']}
+                    )
+                elif row['kind'] == 'goal':
+                    context['goals'].append({'goal': row['a'], 'deadline': row['b']})
+                else:
+                    context['writing_style'] = row['b']
+        except sqlite3.Error as e:
+            print(f"❌ Error building memory context: {e}")
+        
+        return context
+    
+    def search_context(self, query: str, n_mem: int = 5, n_conv: int = 2) -> Dict:
+        """Semantic search for facts and past conversations related to query
+        
+        Returns: {'relevant_facts': [...], 'past_conversations': [...]}
+        
+        The two ChromaDB queries run in parallel when ChromaDB is available.
+        Results are cached per normalized query, so a repeated or retried
+        message skips the embedding and vector search entirely.
+        """
+        self._flush_vectors('facts')  # Bumps _search_version if it adds any
+        
+        key = (_normalize_query(query), n_mem, n_conv, self._search_version)
+        now = time.monotonic()
+        cached = self._get_cached_search(key, now)
+        if cached is not None:
+            return {name: list(items) for name, items in cached.items()}
+        
+        if not self.chroma_available:
+            context = {
+                'relevant_facts': self.recall(query, n_mem),
+                'past_conversations': self.recall_conversations(query, n_conv)
+            }
+        else:
+            self._embed_query(query)  # Once, before both threads need it
+            recall_future = _SEARCH_POOL.submit(self.recall, query, n_mem)
+            convs_future = _SEARCH_POOL.submit(self.recall_conversations, query, n_conv)
+            context = {
+                'relevant_facts': recall_future.result(),
+                'past_conversations': convs_future.result()
+            }
+        
+        self._store_cached_search(key, now, context)
+        return {name: list(items) for name, items in context.items()}
+    
+    def _get_cached_search(self, key: Tuple, now: float):
+        """Cached search result for key (version last), or None if missing/expired"""
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+            if cached and now - cached[0] < self.SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(key)
+                return cached[1]
+        return None
+    
+    def _store_cached_search(self, key: Tuple, now: float, value):
+        """Cache a search result, evicting the least recently used past the limit"""
+        with self._search_cache_lock:
+            # A write landed mid-search: the key is already stale, don't store
+            if key[-1] == self._search_version:
+                self._search_cache[key] = (now, value)
+                self._search_cache.move_to_end(key)
+                while len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+    
+    def _embed_query(self, query: str):
+        """
+        Embedding of query, cached (None = let ChromaDB embed it itself)
+        
+        Why cache embeddings:
+        - recall, recall_conversations and search_files all embed the same
+          chat message; the model runs once instead of per collection
+        - A repeated query skips the model entirely
+        
+        Entries are packed float32 arrays (1.5 KB for 384 dims) rather than
+        lists of Python floats (~12 KB). ChromaDB's HNSW index is float32
+        anyway, so nothing is lost.
+        
+        All collections use ChromaDB's default embedding function, so the
+        facts collection's one embeds queries for every collection.
+        """
+        embed = getattr(self.facts, '_embedding_function', None)
+        if embed is None:
+            return None
+        
+        key = hashlib.sha256(query.encode('utf-8')).digest()
+        with self._embedding_cache_lock:
+            embedding = self._embedding_cache.get(key)
+            if embedding is not None:
+                self._embedding_cache.move_to_end(key)
+                return embedding.tolist()
+        
+        try:
+            embedding = embed([query])[0]
+        except Exception as e:
+            print(f"⚠️ Warning: Query embedding failed: {e}")
+            return None
+        
+        with self._embedding_cache_lock:
+            self._embedding_cache[key] = array('f', embedding)
+            while len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+        return embedding
+    
+    def _query_collection(self, collection, query: str, n_results: int) -> Dict:
+        """collection.query() with the cached query embedding when there is one
+        
+        Only documents + metadatas come back: no caller reads distances.
+        
+        Why cache results here too:
+        - recall, recall_conversations and search_files all come through
+          here, so a repeated query skips the vector search for each
+        - Exact (normalized) matches only: a paraphrase close in embedding
+          space can still ask about a different memory
+        - Callers only read the result, so it is shared as-is
+        """
+        key = (collection.name, _normalize_query(query), n_results, self._search_version)
+        now = time.monotonic()
+        cached = self._get_cached_search(key, now)
+        if cached is not None:
+            return cached
+        
+        include = ["documents", "metadatas"]
+        embedding = self._embed_query(query)
+        if embedding is None:
+            results = collection.query(query_texts=[query], n_results=n_results,
+                                       include=include)
+        else:
+            results = collection.query(query_embeddings=[embedding],
+                                       n_results=n_results, include=include)
+        
+        self._store_cached_search(key, now, results)
+        return results
+    
+    def _invalidate_search_cache(self):
+        """Drop cached search results after a write to facts/conversations"""
+        with self._search_cache_lock:
+            self._search_version += 1
+            self._search_cache.clear()
+    
     def get_facts_about(self, entity: str) -> List[Dict]:
         """Get all facts about a specific entity"""
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 "SELECT * FROM facts WHERE entity = ? ORDER BY created_at DESC",
                 (entity,)
@@ -203,6 +754,7 @@ class Memory:
             print(f"❌ Error getting facts about {entity}: {e}")
             return []
     
+    @serialized_write
     def save_preference(self, key: str, value: str, description: str = None):
         """Save a user preference"""
         try:
@@ -212,7 +764,7 @@ class Memory:
                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)""",
                 (key, value, description)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.Error as e:
             print(f"❌ Error saving preference: {e}")
             raise
@@ -220,7 +772,7 @@ class Memory:
     def get_preference(self, key: str) -> Optional[str]:
         """Get a user preference"""
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute("SELECT value FROM preferences WHERE key = ?", (key,))
             row = cursor.fetchone()
             return row['value'] if row else None
@@ -240,11 +792,10 @@ class Memory:
             return "general"
         
         # Take first 50 chars, clean it up
-        topic = first_user_msg[:50].strip()
+        topic = first_user_msg[:50]
         
-        # Remove common question words
-        for word in ["what", "how", "why", "when", "where", "can you", "please", "help me"]:
-            topic = topic.lower().replace(word, "").strip()
+        # Remove common question words (one pass, whole words only)
+        topic = _TOPIC_STOPWORDS.sub("", topic.lower())
         
         # Clean up
         topic = " ".join(topic.split()[:5])  # Max 5 words
@@ -253,34 +804,62 @@ class Memory:
         return topic if topic else "general"
     
     def save_conversation(self, conversation: List[Dict], topic: str = None):
-        """Save a conversation to both ChromaDB AND text file"""
+        """Save a conversation to both ChromaDB AND text file
+        
+        Why in the background:
+        - Embedding + the file write run on one I/O thread, in save order
+        - Embedding text and log file are built there too, not on the caller
+        - Conversation reads in this class flush() first, so they always
+          see the save
+        """
         if not conversation:
             return None
         
         timestamp = datetime.now()
-        conv_id = f"conv_{timestamp.timestamp()}"
+        conv_id = f"conv_{_timestamp_us(timestamp):016d}"
         
         # Auto-extract topic if not provided
         if not topic:
             topic = self._extract_conversation_topic(conversation)
         
-        conv_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in conversation])
+        metadata = {"topic": topic, "timestamp": timestamp.isoformat(),
+                    "date": timestamp.strftime('%Y-%m-%d'),
+                    "ts": int(timestamp.timestamp())}
         
+        # Copy: the caller keeps appending to its conversation list
+        self._submit_io(self._write_conversation, conv_id, metadata,
+                        list(conversation), timestamp, topic)
+        
+        return conv_id
+    
+    def flush(self):
+        """Add buffered fact/file vectors and wait for queued conversation saves"""
+        self._flush_vectors()
+        with self._io_lock:
+            future = self._io_future
+        if future is not None:
+            future.result()  # One I/O thread: the last job finishes last
+    
+    def _write_conversation(self, conv_id: str, metadata: Dict,
+                            conversation: List[Dict], timestamp: datetime, topic: str):
+        """I/O thread: save one conversation to ChromaDB and a text file"""
         # 1. Save to ChromaDB (for semantic search) - only if available
         if self.chroma_available and self.conversations:
             try:
+                conv_text = "\n".join([f"{msg['role']}: {msg['content']}" for msg in conversation])
                 self.conversations.add(
                     documents=[conv_text],
-                    metadatas=[{"topic": topic, "timestamp": timestamp.isoformat()}],
+                    metadatas=[metadata],
                     ids=[conv_id]
                 )
             except Exception as e:
                 print(f"⚠️ Warning: ChromaDB conversation save failed: {e}")
+            self._invalidate_search_cache()
         
         # 2. ALWAYS save to text file (for easy reading and backup)
         try:
             # Create dated folder
-            date_folder = timestamp.strftime('%Y-%m-%d')  # 2024-11-16
+            date_folder = metadata['date']  # 2024-11-16
             text_folder = Path("conversations") / date_folder
             text_folder.mkdir(parents=True, exist_ok=True)
             
@@ -289,36 +868,35 @@ class Memory:
             filename = f"{timestamp.strftime('%H%M%S')}_{clean_topic}.txt"
             filepath = text_folder / filename
             
-            # Write conversation to file
+            # Build the whole log in one pass, then write it in one call
+            rule = "="*70 + "\n"
+            separator = "\n" + "-"*70 + "\n\n"
+            parts = [
+                rule,
+                "PERSONAL OS CONVERSATION LOG\n",
+                rule,
+                f"Date: {timestamp.strftime('%A, %B %d, %Y')}\n",
+                f"Time: {timestamp.strftime('%H:%M:%S')}\n",
+                f"Topic: {topic}\n",
+                rule + "\n",
+            ]
+            
+            # Each message with formatting
+            for msg in conversation:
+                role = "YOU" if msg['role'] == 'user' else "CLAUDE"
+                parts.append(f"{role}:\n{msg['content']}\n{separator}")
+            
+            parts += [rule, "END OF CONVERSATION\n", rule]
+            
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write("="*70 + "\n")
-                f.write("PERSONAL OS CONVERSATION LOG\n")
-                f.write("="*70 + "\n")
-                f.write(f"Date: {timestamp.strftime('%A, %B %d, %Y')}\n")
-                f.write(f"Time: {timestamp.strftime('%H:%M:%S')}\n")
-                f.write(f"Topic: {topic}\n")
-                f.write("="*70 + "\n\n")
-                
-                # Write each message with formatting
-                for msg in conversation:
-                    role = "YOU" if msg['role'] == 'user' else "CLAUDE"
-                    content = msg['content']
-                    
-                    f.write(f"{role}:\n")
-                    f.write(f"{content}\n")
-                    f.write("\n" + "-"*70 + "\n\n")
-                
-                f.write("="*70 + "\n")
-                f.write("END OF CONVERSATION\n")
-                f.write("="*70 + "\n")
+                f.write("".join(parts))
             
             # print(f"💾 Saved to: {filepath.relative_to(Path.cwd())}")
             
         except Exception as e:
             print(f"❌ Error saving conversation to file: {e}")
-        
-        return conv_id
     
+    @serialized_write
     def add_goal(self, goal: str, deadline: str = None):
         """Add a goal"""
         try:
@@ -327,15 +905,35 @@ class Memory:
                 "INSERT INTO goals (goal, deadline) VALUES (?, ?)",
                 (goal, deadline)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.Error as e:
             print(f"❌ Error adding goal: {e}")
             raise
     
+    def add_goals(self, goals: List[Tuple]) -> int:
+        """
+        Add many goals in one transaction
+        
+        Args:
+            goals: (goal,) or (goal, deadline) tuples
+        
+        Returns: number of goals added
+        """
+        try:
+            with self.transaction():
+                cursor = self.conn.executemany(
+                    "INSERT INTO goals (goal, deadline) VALUES (?, ?)",
+                    [(goal, rest[0] if rest else None) for goal, *rest in goals]
+                )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"❌ Error adding goals: {e}")
+            raise
+    
     def get_active_goals(self) -> List[Dict]:
         """Get active goals"""
         try:
-            cursor = self.conn.cursor()
+            cursor = self._reader().cursor()
             cursor.execute(
                 "SELECT * FROM goals WHERE status = 'active' ORDER BY created_at DESC"
             )
@@ -344,6 +942,28 @@ class Memory:
             print(f"❌ Error getting active goals: {e}")
             return []
     
+    def get_projects_where(self, json_path: str, value) -> List[Dict]:
+        """
+        Get projects whose metadata JSON has value at json_path
+        
+        Example: get_projects_where('$.language', 'python')
+        
+        Why json_extract (not json.loads in Python):
+        - SQLite filters the rows itself; only matches come back
+        - No per-row decode of metadata for projects that don't match
+        """
+        try:
+            cursor = self._reader().cursor()
+            cursor.execute(
+                "SELECT * FROM projects WHERE json_extract(metadata, ?) = ? "
+                "ORDER BY updated_at DESC",
+                (json_path, value)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"❌ Error getting projects: {e}")
+            return []
+    
     def index_file(self, filepath: str, content: str, summary: str = None):
         """Index a file for search"""
         if not self.chroma_available or not self.files:
@@ -351,17 +971,16 @@ class Memory:
             return
         
         try:
-            file_id = f"file_{Path(filepath).name}_{datetime.now().timestamp()}"
+            indexed = datetime.now()
+            file_id = f"file_{Path(filepath).name}_{_timestamp_us(indexed):016d}"
             
-            self.files.add(
-                documents=[content],
-                metadatas=[{
-                    "filepath": filepath,
-                    "summary": summary or "",
-                    "indexed_at": datetime.now().isoformat()
-                }],
-                ids=[file_id]
-            )
+            # Batched with other files (see _queue_vectors)
+            self._queue_vectors('files', [(file_id, content, {
+                "filepath": filepath,
+                "summary": summary or "",
+                "indexed_at": indexed.isoformat(),
+                "ts": int(indexed.timestamp())
+            })])
         except Exception as e:
             print(f"❌ Error indexing file: {e}")
     
@@ -372,21 +991,19 @@ class Memory:
             return []
         
         try:
-            results = self.files.query(
-                query_texts=[query],
-                n_results=n_results
-            )
-            
-            files = []
-            if results['documents'] and results['documents'][0]:
-                for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
-                    files.append({
-                        'content': doc[:500] + "..." if len(doc) > 500 else doc,
-                        'filepath': metadata.get('filepath'),
-                        'summary': metadata.get('summary')
-                    })
+            self._flush_vectors('files')
+            results = self._query_collection(self.files, query, n_results)
             
-            return files
+            if not results['documents']:
+                return []
+            return [
+                {
+                    'content': doc[:500] + "..." if len(doc) > 500 else doc,
+                    'filepath': metadata.get('filepath'),
+                    'summary': metadata.get('summary')
+                }
+                for doc, metadata in zip(results['documents'][0], results['metadatas'][0])
+            ]
         except Exception as e:
             print(f"❌ Error searching files: {e}")
             return []
@@ -397,21 +1014,16 @@ class Memory:
             return []
         
         try:
-            results = self.conversations.query(
-                query_texts=[query],
-                n_results=n_results
-            )
-            
-            convos = []
-            if results['documents'] and results['documents'][0]:
-                for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
-                    convos.append({
-                        'conversation': doc,
-                        'topic': metadata.get('topic'),
-                        'timestamp': metadata.get('timestamp')
-                    })
+            self.flush()
+            results = self._query_collection(self.conversations, query, n_results)
             
-            return convos
+            if not results['documents']:
+                return []
+            return [
+                {'conversation': doc, 'topic': metadata.get('topic'),
+                 'timestamp': metadata.get('timestamp')}
+                for doc, metadata in zip(results['documents'][0], results['metadatas'][0])
+            ]
         except Exception as e:
             print(f"⚠️ Warning: Conversation search failed: {e}")
             return []
@@ -422,8 +1034,6 @@ class Memory:
         Args:
             date_str: Date in format "2024-11-16" or None for today
         """
-        from datetime import date
-        
         if not self.chroma_available or not self.conversations:
             return []
         
@@ -431,21 +1041,22 @@ class Memory:
             date_str = date.today().isoformat()
         
         try:
-            all_convs = self.conversations.get()
+            self.flush()
+            self._backfill_conversation_dates()
             
-            if not all_convs['ids']:
-                return []
+            # ChromaDB filters on the date metadata; only matches come back
+            day_convs = self.conversations.get(
+                where={"date": date_str}, include=["documents", "metadatas"]
+            )
             
-            # Filter by date
-            matching = []
-            for doc, meta in zip(all_convs['documents'], all_convs['metadatas']):
-                timestamp = meta.get('timestamp', '')
-                if timestamp.startswith(date_str):
-                    matching.append({
-                        'conversation': doc,
-                        'topic': meta.get('topic'),
-                        'timestamp': timestamp
-                    })
+            matching = [
+                {
+                    'conversation': doc,
+                    'topic': meta.get('topic'),
+                    'timestamp': meta.get('timestamp', '')
+                }
+                for doc, meta in zip(day_convs['documents'], day_convs['metadatas'])
+            ]
             
             # Sort by timestamp
             matching.sort(key=lambda x: x['timestamp'])
@@ -455,18 +1066,46 @@ class Memory:
             print(f"⚠️ Warning: get_conversations_by_date failed: {e}")
             return []
     
+    def _backfill_conversation_dates(self):
+        """
+        Add the "date" metadata to conversations saved before it existed
+        
+        Runs once per process: one metadata-only scan, then an update of
+        just the conversations that lack it.
+        """
+        if self._conversation_dates_checked:
+            return
+        
+        convs = self.conversations.get(include=["metadatas"])
+        missing = [
+            (conv_id, meta) for conv_id, meta in zip(convs['ids'], convs['metadatas'])
+            if meta is not None and 'date' not in meta and meta.get('timestamp')
+        ]
+        if missing:
+            self.conversations.update(
+                ids=[conv_id for conv_id, _ in missing],
+                metadatas=[{**meta, "date": meta['timestamp'][:10]} for _, meta in missing]
+            )
+        self._conversation_dates_checked = True
+    
     def close(self):
-        """Close database connection"""
+        """Finish queued conversation saves and vectors, then close database
+        connections (safe to call twice)
+        """
+        finalizer = getattr(self, '_finalizer', None)
+        if finalizer is None or not finalizer.alive:
+            return
+        
+        with self._vectors_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        self._flush_vectors()
         try:
-            if hasattr(self, 'conn') and self.conn:
-                self.conn.close()
+            finalizer()  # Runs _close_memory once, then is dead
         except Exception as e:
             print(f"⚠️ Warning: Error closing database: {e}")
     
-    def __del__(self):
-        """Cleanup on deletion"""
-        self.close()
-    
     def __enter__(self):
         """Context manager entry"""
         return self
@@ -0,0 +1,135 @@
+"""On-disk cache for Claude responses"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson  # Optional: faster JSON encoding for cache keys
+except ImportError:
+    orjson = None
+
+# Next to this module, not relative to whatever directory the process runs in
+DEFAULT_DB_PATH = Path(__file__).parent / "response_cache.db"
+
+MAX_AGE_DAYS = 30  # Older responses are treated as misses and pruned
+MAX_ENTRIES = 5000  # Newest responses kept when pruning
+PRUNE_EVERY_WRITES = 100
+
+
+class ResponseCache:
+    """SQLite-backed cache of Claude response text keyed by request hash"""
+    
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path).absolute()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # One connection shared by the summary/lookup pool threads: each
+        # statement + commit runs under this lock so they can't interleave
+        self._lock = threading.Lock()
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created_at)
+        """)
+        self.conn.commit()
+        
+        self._writes = 0
+        self.prune()
+    
+    @staticmethod
+    def make_key(**request) -> str:
+        """Hash a request (model, system, messages, ...) into a cache key"""
+        if orjson:
+            payload = orjson.dumps(request, option=orjson.OPT_SORT_KEYS, default=str)
+        else:
+            payload = json.dumps(request, sort_keys=True, ensure_ascii=False,
+                                 default=str).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on miss (or if older than MAX_AGE_DAYS)"""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT response FROM responses "
+                    "WHERE key = ? AND created_at >= datetime('now', ?)",
+                    (key, f"-{MAX_AGE_DAYS} days")
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: Response cache read failed: {e}")
+            return None
+    
+    def set(self, key: str, response: str):
+        """Store a response (pruning old entries every PRUNE_EVERY_WRITES)"""
+        try:
+            # REPLACE re-inserts the row, so created_at restarts
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+                    (key, response)
+                )
+                self.conn.commit()
+                self._writes += 1
+                prune = self._writes % PRUNE_EVERY_WRITES == 0
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: Response cache write failed: {e}")
+            return
+        
+        if prune:
+            self.prune()
+    
+    def delete(self, key: str):
+        """Drop a cached response (e.g. one that turned out to be unusable)"""
+        try:
+            with self._lock:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: Response cache delete failed: {e}")
+    
+    def prune(self):
+        """
+        Delete responses older than MAX_AGE_DAYS, then all but the newest
+        MAX_ENTRIES
+        
+        Why prune:
+        - Every summarized file and rewrite adds a row; without this the
+          cache grows for as long as Personal OS is used
+        - Runs at startup and every PRUNE_EVERY_WRITES writes, not per write
+        """
+        try:
+            with self._lock:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE created_at < datetime('now', ?)",
+                    (f"-{MAX_AGE_DAYS} days",)
+                )
+                self.conn.execute("""
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses
+                        ORDER BY created_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (MAX_ENTRIES,))
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Warning: Response cache prune failed: {e}")
+    
+    def close(self):
+        """Close database connection"""
+        try:
+            if self.conn:
+                with self._lock:
+                    self.conn.close()
+        except Exception as e:
+            print(f"⚠️ Warning: Error closing response cache: {e}")
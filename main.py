@@ -8,8 +8,7 @@ from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from sympy import re
-from brain.claude_client import PersonalClaude
-from brain.memory import Memory
+from brain.claude_client import get_claude
 from brain.learning_tracker import LearningTracker
 from brain.explanations import ExplanationManager
 
@@ -20,8 +19,8 @@ class PersonalOS:
     """Main interface for Personal OS"""
     
     def __init__(self):
-        self.claude = PersonalClaude()
-        self.memory = Memory()
+        self.claude = get_claude()
+        self.memory = self.claude.memory  # Share one Memory (SQLite + ChromaDB)
         self.learning = LearningTracker()
         self.explanations = ExplanationManager()
         self.conversation = []
@@ -58,6 +57,12 @@ class PersonalOS:
             self.learning.close()
         except Exception as e:
             print(f"⚠️ Warning during cleanup: {e}")
+        
+        # Queued explanation saves: report any that failed to write
+        try:
+            self.explanations.flush()
+        except OSError as e:
+            print(f"❌ {e}")
     
     def _save_conversation_if_needed(self):
         """Periodically save conversation to avoid data loss"""
@@ -196,8 +201,9 @@ class PersonalOS:
                         continue
                     
                     try:
-                        edited = self.claude.apply_writing_style(text)
-                        print(f"\n✨ Edited:\n{edited}")
+                        print("\n✨ Edited:")
+                        self.claude.apply_writing_style(text, stream=True)
+                        print()
                     except Exception as e:
                         print(f"❌ Error: {e}")
                     continue
@@ -227,8 +233,8 @@ class PersonalOS:
                 print("\n🤖 Claude: ", end="", flush=True)
                 
                 try:
-                    response = self.claude.chat(user_input, self.conversation)
-                    print(response)
+                    response = self.claude.chat(user_input, self.conversation, stream=True)
+                    print()
                     
                     # Update conversation history
                     self.conversation.append({"role": "user", "content": user_input})
@@ -997,18 +1003,18 @@ class PersonalOS:
         
         try:
             # Get explanation from Claude
+            # Show explanation as it streams in
+            print("\n" + "="*60)
+            print(f"📖 {topic.title()}")
+            print("="*60)
             response = self.claude.generate_explanation(
                 topic,
                 selected_skill['skill_name'],
                 selected_skill['difficulty'],
-                custom_guidance=custom_guidance
+                custom_guidance=custom_guidance,
+                stream=True
             )
-            
-            # Show explanation
-            print("\n" + "="*60)
-            print(f"📖 {topic.title()}")
-            print("="*60)
-            print(response)
+            print()
             print("="*60)
             
             # Ask to save
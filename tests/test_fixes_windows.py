@@ -186,31 +186,26 @@ def test_memory_command_patterns():
     print("\nTesting memory command patterns...")
     
     try:
-        import re
+        sys.path.insert(0, str(Path(__file__).parent))
+        from brain.claude_client import REMEMBER_PATTERN
         
+        # (message, expected fact or None if it should not trigger)
         test_cases = [
-            ("remember that I like coffee", True),
-            ("don't forget my birthday is June 5", True),
-            ("please remember I'm allergic to peanuts", True),
-            ("keep in mind that I work remotely", True),
-            ("I like pizza", False),  # Should not trigger
-        ]
-        
-        patterns = [
-            r"remember that (.+?)(?:\.|$)",
-            r"remember to (.+?)(?:\.|$)",
-            r"don't forget (?:that )?(.+?)(?:\.|$)",
-            r"please remember (?:that )?(.+?)(?:\.|$)",
-            r"keep in mind (?:that )?(.+?)(?:\.|$)",
+            ("remember that I like coffee", "i like coffee"),
+            ("don't forget my birthday is June 5", "my birthday is june 5"),
+            ("please remember I'm allergic to peanuts", "i'm allergic to peanuts"),
+            ("keep in mind that I work remotely", "i work remotely"),
+            ("I like pizza", None),  # Should not trigger
         ]
         
         passed = 0
-        for text, should_match in test_cases:
-            matched = any(re.search(pattern, text.lower(), re.IGNORECASE) for pattern in patterns)
-            if matched == should_match:
+        for text, expected in test_cases:
+            match = REMEMBER_PATTERN.search(text.lower())
+            got = match.group('fact').strip() if match else None
+            if got == expected:
                 passed += 1
             else:
-                print(f"  ⚠️ Failed: '{text}' (expected match={should_match}, got {matched})")
+                print(f"  ⚠️ Failed: '{text}' (expected {expected!r}, got {got!r})")
         
         if passed == len(test_cases):
             print(f"✅ All {len(test_cases)} pattern tests passed")